@@ -4,22 +4,21 @@
 # Copyright: Kinetica (2021)
 # ---------------------------------------------------------------------------
 
+import collections
 import datetime
 import decimal
 import fcntl
+import importlib
 import itertools
 import json
 import mmap
+import operator
 import os
 import struct
 import sys
+import time
 import uuid
 
-try:
-    import h2o
-except (OSError, ImportError, AttributeError) as e:
-    pass
-
 if sys.version_info < (3,):
     from collections import Mapping, Sequence
 
@@ -46,6 +45,7 @@ if sys.version_info < (3,):
     _not_null = b"\x00"
     _null = b"\x01"
     _null_terminator = b"\x00"
+    _numeric_array_table = None
 else:
     from collections.abc import Mapping, Sequence
 
@@ -70,31 +70,102 @@ else:
     _not_null = 0
     _null = 1
     _null_terminator = 0
+    _numeric_array_table = bytes.maketrans(b"[]\x00", b"  ,")
     xrange = range
 
 
-_bool_struct = struct.Struct("=?")
-_char1_struct = struct.Struct("c")
-_char2_struct = struct.Struct("2s")
-_char4_struct = struct.Struct("4s")
-_char8_struct = struct.Struct("8s")
-_char16_struct = struct.Struct("16s")
-_char32_struct = struct.Struct("32s")
-_char64_struct = struct.Struct("64s")
-_char128_struct = struct.Struct("128s")
-_char256_struct = struct.Struct("256s")
-_double_struct = struct.Struct("=d")
-_float_struct = struct.Struct("=f")
-_int8_struct = struct.Struct("=b")
-_int16_struct = struct.Struct("=h")
-_int32_struct = struct.Struct("=i")
-_int64_struct = struct.Struct("=q")
-_uint32_struct = struct.Struct("=I")
 _uint64_struct = struct.Struct("=Q")
 _uint64_struct_2 = struct.Struct("=2Q")
 
+# Modules of optional integrations by name, imported on first use rather than when this module is loaded; None for
+# those that are not installed
+_backends = {}
+
+
+def _backend(name):
+    # Returns the module of an optional integration, importing it on first use, or None if it is not installed
+    try:
+        return _backends[name]
+    except KeyError:
+        pass
+
+    try:
+        module = importlib.import_module(name)
+    except (OSError, ImportError, AttributeError):
+        module = None
+
+    _backends[name] = module
+    return module
+
+
+# Threads started by ProcData.warm_up() that may still be importing modules; forking while one holds an import lock
+# would leave the lock held forever in the child, so they are joined first (see _join_warm_up)
+_warm_up_threads = []
+
+
+def _warm_up(names):
+    for name in names:
+        _backend(name)
+
+
+def _join_warm_up():
+    # Waits for any warm-up threads to finish importing
+    while _warm_up_threads:
+        _warm_up_threads.pop().join()
+
+
+_timer = getattr(time, "perf_counter", time.time)
+
+
+def _instrument(column, name, stats, count=None):
+    # Replaces a method or codec function of a column with one recording in stats the calls to it, the time taken
+    # and, if count is given, the rows and bytes processed, as returned by count(*args); calls made from within
+    # another instrumented call to the same column are not recorded separately
+    function = getattr(column, name)
+
+    def instrumented(*args, **kwargs):
+        if stats["depth"]:
+            return function(*args, **kwargs)
+
+        stats["depth"] = 1
+        start = _timer()
+
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats["seconds"] += _timer() - start
+            stats["calls"] += 1
+            stats["depth"] = 0
+
+            if count is not None:
+                rows, size = count(*args)
+                stats["rows"] += rows
+                stats["bytes"] += size
+
+    setattr(column, name, instrumented)
+
+
+# Names of the madvise and posix_fadvise options for each access hint accepted by InputColumn.advise; options the
+# platform does not support are skipped
+_advice = {
+    "normal":     ("MADV_NORMAL", "POSIX_FADV_NORMAL"),
+    "sequential": ("MADV_SEQUENTIAL", "POSIX_FADV_SEQUENTIAL"),
+    "random":     ("MADV_RANDOM", "POSIX_FADV_RANDOM"),
+    "willneed":   ("MADV_WILLNEED", "POSIX_FADV_WILLNEED"),
+    "dontneed":   ("MADV_DONTNEED", "POSIX_FADV_DONTNEED"),
+    "hugepage":   ("MADV_HUGEPAGE", None)
+}
+
 
 class _MemoryMappedFile(object):
+    # Factor by which a writable file grows when data is written past its end, so that appending data takes
+    # amortized constant time rather than remapping the file on every page; files written this way are truncated to
+    # the data written once complete
+    growth_factor = 2
+
+    # Number of times files have been grown to write data past their end, for ProcData metrics
+    growths = 0
+
     def __init__(self):
         self.file = None
         self.writable = False
@@ -128,6 +199,15 @@ class _MemoryMappedFile(object):
                     self.data = None
             else:
                 if self.size > 0:
+                    if self.writable:
+                        # Resize the existing mapping in place where the platform supports it
+                        try:
+                            self.data.resize(size)
+                            self.size = size
+                            return
+                        except (OSError, SystemError):
+                            pass
+
                     self.data.close()
 
                 self.data = mmap.mmap(self.file, size, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE if self.writable else mmap.PROT_READ)
@@ -139,15 +219,19 @@ class _MemoryMappedFile(object):
     def unmap(self):
         try:
             if self.file is not None:
-                if self.size > 0:
-                    self.data.close()
-                    self.size = 0
-                    self.data = None
-
-                os.close(self.file)
-                self.file = None
-                self.writable = False
-                self.pos = 0
+                try:
+                    if self.size > 0:
+                        # Fails if views of the mapping are still referenced, in which case the mapping is released
+                        # once they no longer are
+                        data = self.data
+                        self.size = 0
+                        self.data = None
+                        data.close()
+                finally:
+                    os.close(self.file)
+                    self.file = None
+                    self.writable = False
+                    self.pos = 0
         except Exception:
             pass
 
@@ -225,9 +309,87 @@ class _MemoryMappedFile(object):
         _uint64_struct.pack_into(self.data, self.pos, value)
         self.pos += 8
 
+    def reserve(self, length):
+        # Grows the file so that length bytes can be written at the current position without growing it again, and
+        # allocates disk space for it up front where supported
+        size = self.size
+        self._ensure_size(self.pos + length)
+
+        if self.size > size and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(self.file, size, self.size - size)
+            except OSError:
+                pass
+
     def truncate(self):
         self.remap(self.pos)
 
+    def advise(self, advice, start=0, length=None):
+        # Gives the kernel an access hint (see _advice) for length bytes from start, or to the end of the file; hints
+        # are best effort, so any that fail are ignored
+        if self.size == 0:
+            return
+
+        end = self.size if length is None else min(start + length, self.size)
+        start -= start % mmap.PAGESIZE
+
+        if end <= start:
+            return
+
+        madvise_option, fadvise_option = _advice[advice]
+
+        if hasattr(self.data, "madvise") and hasattr(mmap, madvise_option):
+            try:
+                self.data.madvise(getattr(mmap, madvise_option), start, end - start)
+            except (OSError, ValueError):
+                pass
+
+        if fadvise_option is not None and hasattr(os, fadvise_option):
+            try:
+                os.posix_fadvise(self.file, start, end - start, getattr(os, fadvise_option))
+            except OSError:
+                pass
+
+    def resident(self, start=0, length=None):
+        # Returns (resident pages, total pages) for length bytes from start, or to the end of the file, using mincore
+        # on a temporary mapping of those pages, or None if mincore is not available
+        if self.size == 0:
+            return (0, 0)
+
+        end = self.size if length is None else min(start + length, self.size)
+        start -= start % mmap.PAGESIZE
+
+        if end <= start:
+            return (0, 0)
+
+        try:
+            import ctypes
+            libc = ctypes.CDLL(None, use_errno=True)
+            libc.mmap.restype = ctypes.c_void_p
+            libc.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_long]
+            libc.munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+            libc.mincore.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p]
+        except (ImportError, OSError, AttributeError):
+            return None
+
+        length = end - start
+        pages = (length + mmap.PAGESIZE - 1) // mmap.PAGESIZE
+        address = libc.mmap(None, length, mmap.PROT_READ, mmap.MAP_SHARED, self.file, start)
+
+        if address is None or address == ctypes.c_void_p(-1).value:
+            return None
+
+        try:
+            vector = (ctypes.c_ubyte * pages)()
+
+            if libc.mincore(address, length, vector) != 0:
+                return None
+
+            # Only the lowest bit of each byte is defined, and is set for resident pages
+            return (pages - bytearray(vector).count(0), pages)
+        finally:
+            libc.munmap(address, length)
+
     def lock(self, exclusive):
         if self.file is None:
             raise RuntimeError("File not mapped")
@@ -247,8 +409,17 @@ class _MemoryMappedFile(object):
             if not self.writable:
                 raise EOFError("End of file reached")
             else:
-                minSize = pos + length
-                self.remap(minSize + (mmap.PAGESIZE - (minSize % mmap.PAGESIZE)))
+                self._ensure_size(max(pos + length, int(self.size * self.growth_factor)))
+
+    def _ensure_size(self, size):
+        # Grows the file to at least size bytes, rounded up to a whole number of pages
+        if size > self.size:
+            if not self.writable:
+                raise EOFError("End of file reached")
+
+            _MemoryMappedFile.growths += 1
+
+            self.remap(size + (-size % mmap.PAGESIZE))
 
 
 class _ReadOnlyMapping(Mapping):
@@ -282,6 +453,21 @@ def _copy(data, index, value, size):
     data[index * size : (index + 1) * size] = value
 
 
+def _decode_chars(data, index, count, size):
+    # Decodes count CHAR values of the given size starting at the given index; the bytes of all values are reversed
+    # at once, which leaves the values themselves in reverse order with their padding at the end
+    values = [_decode_string(value.rstrip(b"\x00")) for value in _struct(str(size) + "s", count).unpack(data[index * size:(index + count) * size][::-1])]
+    values.reverse()
+    return values
+
+
+def _decode_uuids(data, index, count):
+    # Decodes count UUID values starting at the given index, reversing the bytes of all values at once as for CHAR
+    values = [uuid.UUID(bytes=value) for value in _struct("16s", count).unpack(data[index * 16:(index + count) * 16][::-1])]
+    values.reverse()
+    return values
+
+
 def _decode_date(value):
     return datetime.date(1900 + (value >> 21), (value >> 17) & 0b1111, (value >> 12) & 0b11111)
 
@@ -308,6 +494,403 @@ def _encode_time(value):
     return (value.hour << 26) | (value.minute << 20) | (value.second << 14) | ((value.microsecond // 1000) << 4)
 
 
+def _decode_date_array(values):
+    import numpy as np
+
+    values = values.astype(np.int64)
+    months = ((values >> 21) - 70) * 12 + ((values >> 17) & 0b1111) - 1
+    return months.astype("M8[M]").astype("M8[D]") + (((values >> 12) & 0b11111) - 1).astype("m8[D]")
+
+
+def _decode_datetime_array(values):
+    import numpy as np
+
+    values = values.astype(np.int64)
+    months = ((values >> 53) - 70) * 12 + ((values >> 49) & 0b1111) - 1
+    millis = ((values >> 44) & 0b11111) - 1
+    millis = millis * 24 + ((values >> 39) & 0b11111)
+    millis = millis * 60 + ((values >> 33) & 0b111111)
+    millis = millis * 60 + ((values >> 27) & 0b111111)
+    millis = millis * 1000 + ((values >> 17) & 0b1111111111)
+    return months.astype("M8[M]").astype("M8[ms]") + millis.astype("m8[ms]")
+
+
+def _decode_time_array(values):
+    import numpy as np
+
+    values = values.astype(np.int64)
+    millis = (values >> 26) * 60 + ((values >> 20) & 0b111111)
+    millis = millis * 60 + ((values >> 14) & 0b111111)
+    millis = millis * 1000 + ((values >> 4) & 0b1111111111)
+    return millis.astype("m8[ms]")
+
+
+def _split_date_array(values):
+    import numpy as np
+
+    days = values.astype("M8[D]")
+    months = days.astype("M8[M]")
+    years = months.astype("M8[Y]")
+    return (years.astype(np.int64) + 70,
+            (months - years.astype("M8[M]")).astype(np.int64) + 1,
+            (days - months.astype("M8[D]")).astype(np.int64) + 1,
+            days)
+
+
+def _encode_date_array(values):
+    import numpy as np
+
+    years, months, days, _ = _split_date_array(values)
+    return ((years << 21) | (months << 17) | (days << 12)).astype(np.int32)
+
+
+def _encode_datetime_array(values):
+    import numpy as np
+
+    years, months, days, date = _split_date_array(values)
+    millis = (values.astype("M8[ms]") - date.astype("M8[ms]")).astype(np.int64)
+    return (years << 53) | (months << 49) | (days << 44) | ((millis // 3600000) << 39) \
+           | ((millis // 60000 % 60) << 33) | ((millis // 1000 % 60) << 27) | ((millis % 1000) << 17)
+
+
+def _encode_time_array(values):
+    import numpy as np
+
+    millis = values.astype("m8[ms]").astype(np.int64) % 86400000
+    return ((millis // 3600000) << 26) | ((millis // 60000 % 60) << 20) | ((millis // 1000 % 60) << 14) \
+           | ((millis % 1000) << 4)
+
+
+def _encode_decimal_array(values):
+    # Returns values as stored DECIMAL values with four decimal places, raising as encoding them one at a time would
+    # if any is out of range, rather than letting NumPy wrap them; NaN values (nulls) are stored as zero
+    import numpy as np
+
+    if values.dtype.kind == "f":
+        values = np.where(np.isnan(values), 0, values)
+
+        if not np.isfinite(values).all():
+            raise ValueError("Cannot convert infinite value to DECIMAL")
+
+        scaled = np.rint(values * 10000)
+        invalid = (scaled < -2.0 ** 63) | (scaled >= 2.0 ** 63)
+    else:
+        invalid = (values < -(2 ** 63 // 10000)) | (values > (2 ** 63 - 1) // 10000)
+
+    if invalid.any():
+        raise struct.error("DECIMAL value out of range: " + str(values[invalid][0]))
+
+    if values.dtype.kind == "f":
+        return scaled.astype(np.int64)
+    else:
+        return values.astype(np.int64) * 10000
+
+
+def _encode_ipv4_array(values):
+    # Returns values as stored IPV4 values, accepting signed and unsigned 32-bit addresses and raising for values
+    # outside both ranges, rather than letting NumPy wrap them
+    import numpy as np
+
+    invalid = (values < -2 ** 31) | (values >= 2 ** 32)
+
+    if invalid.any():
+        raise struct.error("IPV4 value out of range: " + str(values[invalid][0]))
+
+    return values.astype(np.int64) & 0xFFFFFFFF
+
+
+def _reverse_items(values, size):
+    # Returns a copy of an array of items of the given size with the bytes of each item reversed, as bytes strings
+    import numpy as np
+
+    values = np.ascontiguousarray(values)
+    return np.ascontiguousarray(values.view(np.uint8).reshape(-1, size)[:, ::-1]).view("S" + str(size)).ravel()
+
+
+def _json_tokens(values):
+    # Returns the JSON text of each value of a NumPy array as a list of strings
+    import numpy as np
+
+    kind = values.dtype.kind
+
+    if kind == "b":
+        return np.where(values, "true", "false").tolist()
+    elif kind in "iu" or (kind == "f" and np.isfinite(values).all()):
+        return values.astype(str).tolist()
+    else:
+        return [json.dumps(value) for value in values.tolist()]
+
+
+def _parse_numeric_arrays(region, lengths):
+    # Parses null-terminated JSON arrays of numbers with the given lengths (including terminators) into a flat NumPy
+    # array of their values and the number of values of each array, without creating an object per value; returns
+    # (None, None) if any array contains anything other than numbers, or digit runs too long to parse exactly
+    import numpy as np
+
+    text = np.frombuffer(region, np.uint8)
+    allowed = np.zeros(256, "?")
+    allowed[np.frombuffer(b"0123456789+-.eE,[] \x00", np.uint8)] = True
+
+    if not allowed[text].all() or np.count_nonzero(text == ord("[")) != np.count_nonzero(lengths >= 3):
+        return None, None
+
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], ((text >= ord("0")) & (text <= ord("9"))).view(np.int8), [0]))))
+
+    if len(edges) > 0 and (edges[1::2] - edges[::2]).max() > 18:
+        return None, None
+
+    commas = np.zeros(len(text) + 1, np.int64)
+    np.cumsum(text == ord(","), out=commas[1:])
+    ends = np.cumsum(lengths)
+    counts = np.where(lengths > 3, commas[ends] - commas[ends - lengths] + 1, 0)
+    is_float = np.isin(text, np.frombuffer(b".eE", np.uint8)).any()
+    separated = region.replace(b"[]\x00", b"").translate(_numeric_array_table).rstrip(b", ")
+
+    try:
+        values = np.loadtxt([separated.decode("ascii")], np.float64 if is_float else np.int64, delimiter=",", ndmin=1) if separated else np.empty(0, np.int64)
+    except ValueError:
+        return None, None
+
+    if len(values) != counts.sum():
+        return None, None
+
+    return values, counts
+
+
+def _uuid_dtype():
+    # Structured dtype of stored UUID values: stored bytes are reversed, so they read as the little-endian 128-bit
+    # integer value of the UUID
+    import numpy as np
+
+    return np.dtype([("low", "<u8"), ("high", "<u8")])
+
+
+def _encode_uuid_array(values):
+    import numpy as np
+
+    if values.dtype.itemsize != 16:
+        raise ValueError("Invalid UUID array item size: " + str(values.dtype.itemsize))
+
+    if values.dtype.names is None:
+        return _reverse_items(values, 16)
+
+    if values.dtype.names != _uuid_dtype().names:
+        raise ValueError("Invalid UUID array fields: " + str(values.dtype.names))
+
+    result = np.empty(len(values), _uuid_dtype())
+    result["low"] = values["low"]
+    result["high"] = values["high"]
+    return result.view("S16")
+
+
+def _ipv4_lookup_array(addresses, networks):
+    # Returns the index in networks of the longest-prefix network containing each address, or -1 if none; networks
+    # are grouped by prefix length, and the addresses are matched against each group with a single binary search
+    import ipaddress
+    import numpy as np
+
+    networks = [ipaddress.IPv4Network(network, strict=False) for network in networks]
+    result = np.full(len(addresses), -1, np.int64)
+    addresses = addresses.astype(np.int64)
+
+    for prefix_length in sorted(set(network.prefixlen for network in networks)):
+        indices = np.array([i for i, network in enumerate(networks) if network.prefixlen == prefix_length], np.int64)
+        keys = np.array([int(networks[i].network_address) >> (32 - prefix_length) for i in indices], np.int64)
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        indices = indices[order]
+        address_keys = addresses >> (32 - prefix_length)
+        positions = np.minimum(np.searchsorted(keys, address_keys), len(keys) - 1)
+        found = keys[positions] == address_keys
+        result[found] = indices[positions[found]]
+
+    return result
+
+
+def _encode_char_strings(values):
+    # Returns an array of strings encoded as a bytes string array, or the array itself if it is already bytes
+    import numpy as np
+
+    if values.dtype.kind == "S":
+        return values
+
+    width = values.dtype.itemsize // 4
+
+    if width > 0:
+        # ASCII strings are encoded by narrowing their code points to bytes
+        codes = np.ascontiguousarray(values).view(np.uint32)
+
+        if not (codes >= 0x80).any():
+            return codes.astype(np.uint8).view("S" + str(width))
+
+    return np.array([_encode_string(value) for value in values.tolist()], "S")
+
+
+def _char_array_overflow(values, size):
+    import numpy as np
+
+    values = _encode_char_strings(values)
+
+    if values.dtype.itemsize <= size:
+        return np.zeros(len(values), "?")
+
+    return np.char.str_len(values) > size
+
+
+def _encode_char_array(values, size):
+    # Values longer than size bytes are truncated, as when encoding them one at a time
+    return _reverse_items(_encode_char_strings(values).astype("S" + str(size)), size)
+
+
+def _encode_timestamp_array(values):
+    return values.astype("M8[ms]").view("=i8")
+
+
+def _arrow_null_mask(array):
+    # Returns a NumPy boolean array that is True where the Arrow array is null, or None if it has no nulls
+    import numpy as np
+
+    if array.null_count == 0:
+        return None
+
+    offset = array.offset
+    valid = np.unpackbits(np.frombuffer(array.buffers()[0], np.uint8), count=offset + len(array), bitorder="little")
+    return valid[offset:] == 0
+
+
+def _arrow_to_numpy(array):
+    # Returns the values of a fixed-width Arrow array as a NumPy array (or DecimalArray for decimal128), or None if
+    # it has no such representation; the values at null positions are unspecified
+    import numpy as np
+    import pyarrow as pa
+
+    if isinstance(array.type, pa.ExtensionType):
+        array = array.storage
+
+    arrow_type = array.type
+    size = len(array)
+    offset = array.offset
+
+    if size == 0:
+        return None
+
+    if pa.types.is_fixed_size_binary(arrow_type):
+        return np.frombuffer(array.buffers()[1], "S" + str(arrow_type.byte_width), size, offset * arrow_type.byte_width)
+
+    if pa.types.is_boolean(arrow_type):
+        values = np.unpackbits(np.frombuffer(array.buffers()[1], np.uint8), count=offset + size, bitorder="little")
+        return values[offset:].astype("?")
+
+    if pa.types.is_decimal128(arrow_type):
+        # Values whose high word is not the sign extension of the low word do not fit in 64 bits; these are
+        # left to be encoded one at a time, which raises if they are out of range
+        words = np.frombuffer(array.buffers()[1], "<i8", size * 2, offset * 16)
+
+        if (words[1::2] != words[::2] >> 63).any():
+            return None
+
+        return ProcData.DecimalArray(words[::2], arrow_type.scale)
+
+    if pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type):
+        storage, dtype = arrow_type.to_pandas_dtype(), None
+    elif pa.types.is_timestamp(arrow_type):
+        storage, dtype = np.int64, "M8[" + arrow_type.unit + "]"
+    elif pa.types.is_duration(arrow_type):
+        storage, dtype = np.int64, "m8[" + arrow_type.unit + "]"
+    elif pa.types.is_date32(arrow_type):
+        storage, dtype = np.int32, "M8[D]"
+    elif pa.types.is_date64(arrow_type):
+        storage, dtype = np.int64, "M8[ms]"
+    elif pa.types.is_time32(arrow_type):
+        storage, dtype = np.int32, "m8[" + arrow_type.unit + "]"
+    elif pa.types.is_time64(arrow_type):
+        storage, dtype = np.int64, "m8[" + arrow_type.unit + "]"
+    else:
+        return None
+
+    values = np.frombuffer(array.buffers()[1], storage, size, offset * np.dtype(storage).itemsize)
+
+    if dtype is None:
+        return values
+
+    return values.astype(np.int64).view(dtype)
+
+
+# Structs for several consecutive values, keyed by (format, count); only small counts are cached, as a struct for a
+# repeated format such as "16s" takes memory in proportion to its count
+_structs = {}
+
+
+def _struct(format, count):
+    # Returns a struct for count consecutive values of the given single-value format, cached so that decoding or
+    # encoding the same number of values repeatedly does not build a new format each time
+    if count > 4096:
+        return struct.Struct(format * count if format[-1] == "s" else "=" + str(count) + format)
+
+    key = (format, count)
+    result = _structs.get(key)
+
+    if result is None:
+        if len(_structs) >= 128:
+            _structs.clear()
+
+        result = struct.Struct(format * count if format[-1] == "s" else "=" + str(count) + format)
+        _structs[key] = result
+
+    return result
+
+
+class _Codec(object):
+    # The functions that decode and encode values of a Kinetica type, shared by all columns of that type (see
+    # _codecs). For fixed-width types, decode_one(data, index) and decode_many(data, index, count) decode values of
+    # column data, and encode_one(data, index, value) and encode_many(data, index, values) encode values into it. For
+    # variable-length types, decode_one(var_data, start, end) decodes a value of var data and encode_one(var_data,
+    # value) appends a value to a var data file; values of these types are decoded in bulk by the column, and
+    # decode_many and encode_many are None
+    def __init__(self, size, decode_one, decode_many, encode_one, encode_many):
+        self.size = size
+        self.decode_one = decode_one
+        self.decode_many = decode_many
+        self.encode_one = encode_one
+        self.encode_many = encode_many
+
+
+def _fixed_codec(size, format, decode=None, encode=None):
+    # Returns the codec of a fixed-width type stored as values of a single struct format, converted by decode and
+    # encode if given
+    single = struct.Struct("=" + format)
+    unpack_from = single.unpack_from
+    pack_into = single.pack_into
+
+    if decode is None:
+        decode_one = lambda data, index: unpack_from(data, index * size)[0]
+        decode_many = lambda data, index, count: list(_struct(format, count).unpack_from(data, index * size))
+    else:
+        decode_one = lambda data, index: decode(unpack_from(data, index * size)[0])
+        decode_many = lambda data, index, count: [decode(value) for value in _struct(format, count).unpack_from(data, index * size)]
+
+    if encode is None:
+        encode_one = lambda data, index, value: pack_into(data, index * size, value)
+        encode_many = lambda data, index, values: _struct(format, len(values)).pack_into(data, index * size, *values)
+    else:
+        encode_one = lambda data, index, value: pack_into(data, index * size, encode(value))
+        encode_many = lambda data, index, values: _struct(format, len(values)).pack_into(data, index * size, *[encode(value) for value in values])
+
+    return _Codec(size, decode_one, decode_many, encode_one, encode_many)
+
+
+def _char_codec(size):
+    codec = _fixed_codec(size, str(size) + "s", _decode_char, lambda value: _encode_char(value, size))
+    codec.decode_many = lambda data, index, count: _decode_chars(data, index, count, size)
+    return codec
+
+
+def _uuid_codec():
+    codec = _fixed_codec(16, "16s", lambda value: uuid.UUID(bytes=value[15::-1]), lambda value: value.bytes[15::-1])
+    codec.decode_many = _decode_uuids
+    return codec
+
+
 class ProcData(_SingletonType("_Singleton", (object,), {})):
     class ColumnType(object):
         ARRAY     = 0x80000000
@@ -341,142 +924,107 @@ class ProcData(_SingletonType("_Singleton", (object,), {})):
         VECTOR    = 0x40000000
 
 
+    class DecimalArray(Sequence):
+        """Fixed-point decimal values held as a NumPy int64 array of unscaled values, where each decimal value is
+            values[i] * 10 ** -scale. Returned by InputColumn.as_decimal() and accepted by DECIMAL output columns,
+            allowing exact integer arithmetic on the unscaled values without creating a Decimal object per value.
+        """
+        def __init__(self, values, scale=4):
+            import numpy as np
+
+            self._values = np.asarray(values, np.int64)
+            self._scale = scale
+
+        @property
+        def values(self):
+            return self._values
+
+        @property
+        def scale(self):
+            return self._scale
+
+        def to_float(self):
+            """Convert to a NumPy float64 array.
+
+                Returns:
+                     NumPy float64 array of the decimal values.
+            """
+            return self._values / float(10 ** self._scale)
+
+        def rescale(self, scale):
+            """Convert to a different scale, rounding half to even when the scale is reduced.
+
+                Args:
+                    scale: The number of decimal places of the result.
+
+                Returns:
+                     DecimalArray with the given scale.
+            """
+            import numpy as np
+
+            if scale >= self._scale:
+                factor = 10 ** (scale - self._scale)
+                limit = (2 ** 63 - 1) // factor
+
+                if ((self._values > limit) | (self._values < -limit)).any():
+                    raise OverflowError("Decimal value out of range for scale " + str(scale))
+
+                return ProcData.DecimalArray(self._values * factor if limit > 0 else np.zeros_like(self._values), scale)
+
+            divisor = 10 ** (self._scale - scale)
+            quotient, remainder = np.divmod(self._values, divisor)
+            half = divisor // 2
+            quotient += (remainder > half) | ((remainder == half) & (quotient % 2 == 1))
+            return ProcData.DecimalArray(quotient, scale)
+
+        def __getitem__(self, index):
+            if isinstance(index, slice):
+                return ProcData.DecimalArray(self._values[index], self._scale)
+            else:
+                return decimal.Decimal(int(self._values[index])).scaleb(-self._scale)
+
+        def __len__(self):
+            return len(self._values)
+
+        def __repr__(self):
+            return "DecimalArray(" + repr(self._values) + ", scale=" + str(self._scale) + ")"
+
+
     class Column(Sequence):
         def __init__(self, file, writable):
             self._name = file.read_string()
             self._type = file.read_uint64()
 
-            self._type_size = {
-                ProcData.ColumnType.ARRAY:       8,
-                ProcData.ColumnType.BOOLEAN:     1,
-                ProcData.ColumnType.BYTES:       8,
-                ProcData.ColumnType.CHAR1:       1,
-                ProcData.ColumnType.CHAR2:       2,
-                ProcData.ColumnType.CHAR4:       4,
-                ProcData.ColumnType.CHAR8:       8,
-                ProcData.ColumnType.CHAR16:     16,
-                ProcData.ColumnType.CHAR32:     32,
-                ProcData.ColumnType.CHAR64:     64,
-                ProcData.ColumnType.CHAR128:   128,
-                ProcData.ColumnType.CHAR256:   256,
-                ProcData.ColumnType.DATE:        4,
-                ProcData.ColumnType.DATETIME:    8,
-                ProcData.ColumnType.DECIMAL:     8,
-                ProcData.ColumnType.DOUBLE:      8,
-                ProcData.ColumnType.FLOAT:       4,
-                ProcData.ColumnType.INT:         4,
-                ProcData.ColumnType.INT8:        1,
-                ProcData.ColumnType.INT16:       2,
-                ProcData.ColumnType.IPV4:        4,
-                ProcData.ColumnType.JSON:        8,
-                ProcData.ColumnType.LONG:        8,
-                ProcData.ColumnType.STRING:      8,
-                ProcData.ColumnType.TIME:        4,
-                ProcData.ColumnType.TIMESTAMP:   8,
-                ProcData.ColumnType.ULONG:       8,
-                ProcData.ColumnType.UUID:       16,
-                ProcData.ColumnType.VECTOR:      8
-            }.get(self._type, None)
+            codec = _codecs.get(self._type)
 
-            if self._type_size is None:
+            if codec is None:
                 raise ValueError("Unknown data type: " + str(self._type))
 
-            data_path = file.read_string()
-            self._data = _MemoryMappedFile()
-
-            if data_path:
-                self._data.map(data_path, writable)
-                self._size = self._data.size // self._type_size
-            else:
-                self._size = 0
+            self._type_size = codec.size
+            self._interned = None
 
+            # Column files are mapped on first access to _data, _nulls or _var_data (see __getattr__), so that
+            # columns that are not used cost no file descriptors or mappings
+            data_path = file.read_string()
             nulls_path = file.read_string()
-            self._nulls = _MemoryMappedFile()
+            var_data_path = file.read_string()
+            self._paths = (data_path, nulls_path, var_data_path)
+            self._writable = writable
 
-            if nulls_path:
-                self._nulls.map(nulls_path, writable)
-                self._is_nullable = True
+            if data_path and os.path.exists(data_path):
+                self._size = os.stat(data_path).st_size // self._type_size
             else:
-                self._is_nullable = False
-
-            var_data_path = file.read_string()
-            self._var_data = _MemoryMappedFile()
+                self._size = 0
 
-            if var_data_path:
-                self._var_data.map(var_data_path, writable)
+            self._is_nullable = bool(nulls_path)
+            self._var_type = self._type in (ProcData.ColumnType.ARRAY, ProcData.ColumnType.BYTES, ProcData.ColumnType.JSON, ProcData.ColumnType.STRING, ProcData.ColumnType.VECTOR)
 
-            if self._type == ProcData.ColumnType.ARRAY:
-                self._var_type = True
-                self._decode_var_value = lambda var_data, start, end: None if end - start <= 1 else json.loads(_decode_string(struct.unpack_from(str(end - start - 1) + "s", var_data, start)[0]))
-                self._encode_var_value = lambda var_data, value: var_data.write(_encode_string(json.dumps(value)), True)
-            elif self._type == ProcData.ColumnType.BYTES:
-                self._var_type = True
-                self._decode_var_value = lambda var_data, start, end: b"" if start == end else struct.unpack_from(str(end - start) + "s", var_data, start)[0]
-                self._encode_var_value = lambda var_data, value: var_data.write(value, False)
-            elif self._type in (ProcData.ColumnType.JSON, ProcData.ColumnType.STRING):
-                self._var_type = True
-                self._decode_var_value = lambda var_data, start, end: "" if end - start <= 1 else _decode_string(struct.unpack_from(str(end - start - 1) + "s", var_data, start)[0])
-                self._encode_var_value = lambda var_data, value: var_data.write(_encode_string(value), True)
-            elif self._type == ProcData.ColumnType.VECTOR:
-                self._var_type = True
-                self._decode_var_value = lambda var_data, start, end: None if start == end else list(struct.unpack_from("=" + str((end - start) // 4) + "f", var_data, start))
-                self._encode_var_value = lambda var_data, value: var_data.write(struct.pack("=" + str(len(value)) + "f", *value), False)
+            if self._var_type:
+                self._decode_var_value = codec.decode_one
+                self._encode_var_value = codec.encode_one
             else:
-                self._var_type = False
-
-                self._decode_value = {
-                    ProcData.ColumnType.BOOLEAN: lambda data, index: _bool_struct.unpack_from(data, index)[0],
-                    ProcData.ColumnType.CHAR1: lambda data, index: _decode_char(_char1_struct.unpack_from(data, index)[0]),
-                    ProcData.ColumnType.CHAR2: lambda data, index: _decode_char(_char2_struct.unpack_from(data, index * 2)[0]),
-                    ProcData.ColumnType.CHAR4: lambda data, index: _decode_char(_char4_struct.unpack_from(data, index * 4)[0]),
-                    ProcData.ColumnType.CHAR8: lambda data, index: _decode_char(_char8_struct.unpack_from(data, index * 8)[0]),
-                    ProcData.ColumnType.CHAR16: lambda data, index: _decode_char(_char16_struct.unpack_from(data, index * 16)[0]),
-                    ProcData.ColumnType.CHAR32: lambda data, index: _decode_char(_char32_struct.unpack_from(data, index * 32)[0]),
-                    ProcData.ColumnType.CHAR64: lambda data, index: _decode_char(_char64_struct.unpack_from(data, index * 64)[0]),
-                    ProcData.ColumnType.CHAR128: lambda data, index: _decode_char(_char128_struct.unpack_from(data, index * 128)[0]),
-                    ProcData.ColumnType.CHAR256: lambda data, index: _decode_char(_char256_struct.unpack_from(data, index * 256)[0]),
-                    ProcData.ColumnType.DATE: lambda data, index: _decode_date(_int32_struct.unpack_from(data, index * 4)[0]),
-                    ProcData.ColumnType.DATETIME: lambda data, index: _decode_datetime(_int64_struct.unpack_from(data, index * 8)[0]),
-                    ProcData.ColumnType.DECIMAL: lambda data, index: decimal.Decimal(_int64_struct.unpack_from(data, index * 8)[0]).scaleb(-4),
-                    ProcData.ColumnType.DOUBLE: lambda data, index: _double_struct.unpack_from(data, index * 8)[0],
-                    ProcData.ColumnType.FLOAT: lambda data, index: _float_struct.unpack_from(data, index * 4)[0],
-                    ProcData.ColumnType.INT: lambda data, index: _int32_struct.unpack_from(data, index * 4)[0],
-                    ProcData.ColumnType.INT8: lambda data, index: _int8_struct.unpack_from(data, index)[0],
-                    ProcData.ColumnType.INT16: lambda data, index: _int16_struct.unpack_from(data, index * 2)[0],
-                    ProcData.ColumnType.IPV4: lambda data, index: _int32_struct.unpack_from(data, index * 4)[0],
-                    ProcData.ColumnType.LONG: lambda data, index: _int64_struct.unpack_from(data, index * 8)[0],
-                    ProcData.ColumnType.TIME: lambda data, index: _decode_time(_uint32_struct.unpack_from(data, index * 4)[0]),
-                    ProcData.ColumnType.TIMESTAMP: lambda data, index: _int64_struct.unpack_from(data, index * 8)[0],
-                    ProcData.ColumnType.ULONG: lambda data, index: _uint64_struct.unpack_from(data, index * 8)[0],
-                    ProcData.ColumnType.UUID: lambda data, index: uuid.UUID(bytes=_char16_struct.unpack_from(data, index * 16)[0][15::-1])
-                }[self._type]
-
-                self._decode_multiple = {
-                    ProcData.ColumnType.BOOLEAN: lambda data, index, count: list(struct.unpack_from("=" + str(count) + "?", data, index)),
-                    ProcData.ColumnType.CHAR1: lambda data, index, count: [_decode_char(value) for value in struct.unpack_from(str(count) + "c", data, index)],
-                    ProcData.ColumnType.CHAR2: lambda data, index, count: [_decode_char(value) for value in struct.unpack_from("2s" * count, data, index * 2)],
-                    ProcData.ColumnType.CHAR4: lambda data, index, count: [_decode_char(value) for value in struct.unpack_from("4s" * count, data, index * 4)],
-                    ProcData.ColumnType.CHAR8: lambda data, index, count: [_decode_char(value) for value in struct.unpack_from("8s" * count, data, index * 8)],
-                    ProcData.ColumnType.CHAR16: lambda data, index, count: [_decode_char(value) for value in struct.unpack_from("16s" * count, data, index * 16)],
-                    ProcData.ColumnType.CHAR32: lambda data, index, count: [_decode_char(value) for value in struct.unpack_from("32s" * count, data, index * 32)],
-                    ProcData.ColumnType.CHAR64: lambda data, index, count: [_decode_char(value) for value in struct.unpack_from("64s" * count, data, index * 64)],
-                    ProcData.ColumnType.CHAR128: lambda data, index, count: [_decode_char(value) for value in struct.unpack_from("128s" * count, data, index * 128)],
-                    ProcData.ColumnType.CHAR256: lambda data, index, count: [_decode_char(value) for value in struct.unpack_from("256s" * count, data, index * 256)],
-                    ProcData.ColumnType.DATE: lambda data, index, count: [_decode_date(value) for value in struct.unpack_from("=" + str(count) + "i", data, index * 4)],
-                    ProcData.ColumnType.DATETIME: lambda data, index, count: [_decode_datetime(value) for value in struct.unpack_from("=" + str(count) + "q", data, index * 8)],
-                    ProcData.ColumnType.DECIMAL: lambda data, index, count: [decimal.Decimal(value).scaleb(-4) for value in struct.unpack_from("=" + str(count) + "q", data, index * 8)],
-                    ProcData.ColumnType.DOUBLE: lambda data, index, count: list(struct.unpack_from("=" + str(count) + "d", data, index * 8)),
-                    ProcData.ColumnType.FLOAT: lambda data, index, count: list(struct.unpack_from("=" + str(count) + "f", data, index * 4)),
-                    ProcData.ColumnType.INT: lambda data, index, count: list(struct.unpack_from("=" + str(count) + "i", data, index * 4)),
-                    ProcData.ColumnType.INT8: lambda data, index, count: list(struct.unpack_from("=" + str(count) + "b", data, index)),
-                    ProcData.ColumnType.INT16: lambda data, index, count: list(struct.unpack_from("=" + str(count) + "h", data, index * 2)),
-                    ProcData.ColumnType.IPV4: lambda data, index, count: list(struct.unpack_from("=" + str(count) + "i", data, index * 4)),
-                    ProcData.ColumnType.LONG: lambda data, index, count: list(struct.unpack_from("=" + str(count) + "q", data, index * 8)),
-                    ProcData.ColumnType.TIME: lambda data, index, count: [_decode_time(value) for value in struct.unpack_from("=" + str(count) + "I", data, index * 4)],
-                    ProcData.ColumnType.TIMESTAMP: lambda data, index, count: list(struct.unpack_from("=" + str(count) + "q", data, index * 8)),
-                    ProcData.ColumnType.ULONG: lambda data, index, count: list(struct.unpack_from('=' + str(count) + "Q", data, index * 8)),
-                    ProcData.ColumnType.UUID: lambda data, index, count: list(uuid.UUID(bytes=value[15::-1]) for value in struct.unpack_from("16s" * count, data, index * 16))
-                }[self._type]
+                self._decode_value = codec.decode_one
+                self._decode_multiple = codec.decode_many
 
         @property
         def name(self):
@@ -494,6 +1042,33 @@ class ProcData(_SingletonType("_Singleton", (object,), {})):
         def size(self):
             return self._size
 
+        @property
+        def is_mapped(self):
+            """Whether the column files are currently memory-mapped. Column files are mapped when column data is
+                first accessed, rather than when the proc data is loaded.
+            """
+            return "_data" in self.__dict__
+
+        def __getattr__(self, name):
+            # Maps the column files on first access to them; only called for attributes not otherwise found, so
+            # access to mapped files costs nothing extra
+            if name in ("_data", "_nulls", "_var_data"):
+                self._map()
+                return self.__dict__[name]
+
+            raise AttributeError(name)
+
+        def _map(self):
+            files = []
+
+            for path in self._paths:
+                files.append(_MemoryMappedFile())
+
+                if path:
+                    files[-1].map(path, self._writable)
+
+            self._data, self._nulls, self._var_data = files
+
         def __getitem__(self, index):
             if isinstance(index, _integer_types):
                 size = self._size
@@ -504,6 +1079,9 @@ class ProcData(_SingletonType("_Singleton", (object,), {})):
                 if index < 0 or index >= size:
                     raise IndexError("Index out of range: " + str(index))
 
+                if self._interned is not None:
+                    return self._decode_interned(index, index + 1)[0]
+
                 if not self._var_type:
                     if self._is_nullable:
                         return None if self._nulls.data[index] == _null else self._decode_value(self._data.data, index)
@@ -531,83 +1109,1196 @@ class ProcData(_SingletonType("_Singleton", (object,), {})):
                     if start == stop:
                         return []
 
-                    if not self._var_type:
-                        result = self._decode_multiple(self._data.data, start, stop - start)
-                    else:
-                        var_data = self._var_data
-                        decode_var_value = self._decode_var_value
-
-                        if (stop < size):
-                            positions = struct.unpack_from("=" + str(stop - start + 1) + "Q", self._data.data, start * 8)
-                        else:
-                            positions = list(struct.unpack_from("=" + str(stop - start) + "Q", self._data.data, start * 8))
-                            positions.append(var_data.size)
-
-                        result = [decode_var_value(var_data.data, positions[i], positions[i + 1]) for i in xrange(0, len(positions) - 1)]
-
-                    if self._is_nullable:
-                        for i, null in enumerate(struct.unpack_from(str(stop - start) + "c", self._nulls.data, start)):
-                            if null == b"\x01":
-                                result[i] = None
-
-                    return result
+                    return self._decode_range(start, stop)
                 else:
                     return [self[i] for i in xrange(*index.indices(self._size))]
             else:
                 raise TypeError("Invalid index specified: " + str(index))
 
-        def __iter__(self):
-            for i in xrange(0, self._size, 1024):
-                for value in self[i:i + 1024]:
-                    yield value
+        def _decode_range(self, start, stop):
+            # Decodes the values of rows start to stop (exclusive, start < stop <= size) into a list
+            if self._interned is not None:
+                return self._decode_interned(start, stop)
 
-        def __len__(self):
-            return self._size
+            if not self._var_type:
+                if self._type in (ProcData.ColumnType.DATE, ProcData.ColumnType.DATETIME) and self._is_nullable:
+                    return self._decode_non_null(start, stop)
 
+                result = self._decode_multiple(self._data.data, start, stop - start)
+            else:
+                positions = self._positions(start, stop)
+
+                if self._type in (ProcData.ColumnType.JSON, ProcData.ColumnType.STRING):
+                    result = self._decode_strings(positions, False, False)
+                elif self._type == ProcData.ColumnType.BYTES:
+                    result = self._decode_bytes(positions)
+                elif self._type == ProcData.ColumnType.VECTOR:
+                    result = self._decode_vectors(positions)
+                else:
+                    result = self._decode_arrays(positions)
 
-    class InputColumn(Column):
-        def __init__(self, file):
-            super(ProcData.InputColumn, self).__init__(file, False)
+            self._set_nulls(result, start, stop)
+            return result
 
+        def _decode_non_null(self, start, stop):
+            # Decodes the values of rows start to stop (exclusive, start < stop <= size) of a nullable fixed-width
+            # column into a list, decoding only runs of rows that are not null, for types whose unset data of null
+            # rows is not a valid value
+            nulls = self._nulls.data
+            data = self._data.data
+            decode_multiple = self._decode_multiple
+            result = []
+            i = start
 
-    class OutputColumn(Column):
+            while i < stop:
+                null = nulls.find(b"\x01", i, stop)
+
+                if null == -1:
+                    null = stop
+
+                if null > i:
+                    result.extend(decode_multiple(data, i, null - i))
+
+                if null < stop:
+                    result.append(None)
+
+                i = null + 1
+
+            return result
+
+        def _positions(self, start, stop):
+            # Returns the var data positions of rows start to stop (exclusive, start < stop <= size), followed by
+            # the end position of the last row
+            if stop < self._size:
+                return _struct("Q", stop - start + 1).unpack_from(self._data.data, start * 8)
+            else:
+                positions = list(_struct("Q", stop - start).unpack_from(self._data.data, start * 8))
+                positions.append(self._var_data.size)
+                return positions
+
+        def _set_nulls(self, result, start, stop):
+            # Replaces the decoded values of null rows in result, which holds rows start to stop, with None
+            if self._is_nullable:
+                nulls = self._nulls.data
+                i = nulls.find(b"\x01", start, stop)
+
+                while i != -1:
+                    result[i - start] = None
+                    i = nulls.find(b"\x01", i + 1, stop)
+
+        def _decode_strings(self, positions, as_bytes, ascii):
+            # Decodes null-terminated values at the given positions by decoding the whole var data range at once
+            # and splitting it at the terminators, falling back to decoding each value if any contains a null
+            count = len(positions) - 1
+            first = positions[0]
+            last = positions[-1]
+            empty = b"" if as_bytes else _decode_string(b"")
+
+            if first == last:
+                return [empty] * count
+
+            region = self._var_data.data[first:last]
+
+            if as_bytes:
+                decode = bytes
+                terminator = b"\x00"
+            else:
+                decode = (lambda b: b.decode("ascii", "replace")) if ascii else _decode_string
+                terminator = decode(b"\x00")
+                region = decode(region)
+
+            values = region.split(terminator)
+            flags = list(map(operator.lt, positions, itertools.islice(positions, 1, None)))
+            non_empty = sum(flags)
+
+            if len(values) != non_empty + 1:
+                var_data = self._var_data.data
+                return [decode(var_data[positions[i]:positions[i + 1] - 1]) if positions[i + 1] - positions[i] > 1 else empty
+                        for i in xrange(0, count)]
+
+            if non_empty == count:
+                values.pop()
+                return values
+
+            values = iter(values)
+            return [next(values) if flag else empty for flag in flags]
+
+        def _decode_bytes(self, positions):
+            # Decodes unterminated values at the given positions by slicing the whole var data range at once
+            first = positions[0]
+            region = self._var_data.data[first:positions[-1]]
+            return [region[positions[i] - first:positions[i + 1] - first] for i in xrange(0, len(positions) - 1)]
+
+        def _decode_vectors(self, positions):
+            # Decodes the float values at the given positions with a single unpack of the whole var data range
+            first = positions[0]
+            last = positions[-1]
+            values = struct.unpack_from("=" + str((last - first) // 4) + "f", self._var_data.data, first) if last > first else ()
+            return [list(values[(positions[i] - first) // 4:(positions[i + 1] - first) // 4]) if positions[i + 1] > positions[i] else None
+                    for i in xrange(0, len(positions) - 1)]
+
+        def _decode_arrays(self, positions):
+            # Decodes the JSON arrays at the given positions by joining the whole var data range into a single JSON
+            # array of arrays and parsing it at once, falling back to parsing each value if that fails
+            count = len(positions) - 1
+            first = positions[0]
+            last = positions[-1]
+            var_data = self._var_data.data
+
+            if first == last:
+                return [None] * count
+
+            lengths = list(map(operator.sub, itertools.islice(positions, 1, None), positions))
+
+            if 1 not in lengths:
+                # Values cannot contain a literal null byte, so each terminator separates two values
+                try:
+                    values = json.loads(_decode_string(b"[" + var_data[first:last - 1].replace(b"\x00", b",") + b"]"))
+                except ValueError:
+                    values = None
+
+                if values is not None and len(values) == count - lengths.count(0):
+                    values = iter(values)
+                    return [next(values) if length else None for length in lengths]
+
+            decode_var_value = self._decode_var_value
+            return [decode_var_value(var_data, positions[i], positions[i + 1]) for i in xrange(0, count)]
+
+        def _range_size(self, start, stop):
+            # Returns (rows, bytes) for rows start to stop of the column files, for ProcData metrics
+            start, stop = slice(start, stop).indices(self._size)[:2]
+            rows = max(stop - start, 0)
+            size = rows * self._type_size + (rows if self._is_nullable else 0)
+
+            if self._var_type and rows > 0:
+                first = _uint64_struct.unpack_from(self._data.data, start * 8)[0]
+                last = _uint64_struct.unpack_from(self._data.data, stop * 8)[0] if stop < self._size else self._var_data.size
+                size += last - first
+
+            return (rows, size)
+
+        def _is_char(self):
+            return self._type in (ProcData.ColumnType.CHAR1, ProcData.ColumnType.CHAR2, ProcData.ColumnType.CHAR4,
+                                  ProcData.ColumnType.CHAR8, ProcData.ColumnType.CHAR16, ProcData.ColumnType.CHAR32,
+                                  ProcData.ColumnType.CHAR64, ProcData.ColumnType.CHAR128, ProcData.ColumnType.CHAR256)
+
+        def _numpy_dtype(self):
+            return {
+                ProcData.ColumnType.BOOLEAN:   "=?",
+                ProcData.ColumnType.DOUBLE:    "=f8",
+                ProcData.ColumnType.FLOAT:     "=f4",
+                ProcData.ColumnType.INT:       "=i4",
+                ProcData.ColumnType.INT8:      "=i1",
+                ProcData.ColumnType.INT16:     "=i2",
+                ProcData.ColumnType.LONG:      "=i8",
+                ProcData.ColumnType.TIMESTAMP: "=i8",
+                ProcData.ColumnType.ULONG:     "=u8"
+            }.get(self._type, None)
+
+        def __iter__(self):
+            for i in xrange(0, self._size, 1024):
+                for value in self[i:i + 1024]:
+                    yield value
+
+        def __len__(self):
+            return self._size
+
+
+    class InputColumn(Column):
+        def __init__(self, file):
+            super(ProcData.InputColumn, self).__init__(file, False)
+
+        def decode_strings(self, start=0, stop=None, as_bytes=False, ascii=False):
+            """Decode the values of a range of rows of a STRING or JSON column in bulk, decoding the whole range of
+                var data at once and splitting it into values, rather than decoding each value separately.
+
+                Args:
+                    start: The first row to decode.
+                    stop: The row after the last row to decode; the column size by default.
+                    as_bytes: Whether to return the undecoded bytes of each value instead of str.
+                    ascii: Whether to decode as ASCII rather than UTF-8 (non-ASCII bytes are replaced), which is
+                        faster for data known to be ASCII.
+
+                Returns:
+                     List of values (None for null rows).
+            """
+            if self._type not in (ProcData.ColumnType.JSON, ProcData.ColumnType.STRING):
+                raise TypeError("Cannot decode column " + self._name + " of type " + str(self._type) + " as strings")
+
+            start, stop, _ = slice(start, stop).indices(self._size)
+
+            if start >= stop:
+                return []
+
+            result = self._decode_strings(self._positions(start, stop), as_bytes, ascii)
+            self._set_nulls(result, start, stop)
+            return result
+
+        def enable_interning(self, max_size=4096):
+            """Enable interning of decoded values, so that rows with the same raw value share a single decoded
+                value object instead of each getting a new one. Decoded values are memoized by raw value in a cache
+                holding up to max_size of the most recently used values; for columns where most values repeat,
+                this saves memory, as well as decoding time for all but STRING, JSON, and BYTES columns. Applies to
+                indexing, slicing, and iteration of the column and to row iteration of its table.
+
+                Supported for BYTES, CHAR1 to CHAR256, DATE, DATETIME, DECIMAL, JSON, STRING, TIME, and UUID columns.
+
+                Args:
+                    max_size: The maximum number of decoded values to keep.
+            """
+            if max_size <= 0:
+                raise ValueError("Invalid interning cache size specified: " + str(max_size))
+
+            decode = self._raw_decoder()
+
+            if decode is None:
+                raise TypeError("Cannot intern values of column " + self._name + " of type " + str(self._type))
+
+            if self._interned is None:
+                self._interned = collections.OrderedDict()
+                self._interning_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+            self._decode_raw = decode
+            self._interning_max_size = max_size
+            self._evict_interned()
+
+        def disable_interning(self):
+            """Disable interning of decoded values and release the cached values."""
+            self._interned = None
+
+        @property
+        def interning_stats(self):
+            """Statistics of interning of decoded values since it was enabled, as a dict with the number of
+                values cached ("size"), the cache capacity ("max_size"), the number of non-null rows decoded from the
+                cache ("hits") and by decoding their raw value ("misses"), the fraction of hits ("hit_rate"), and the
+                number of values dropped from the cache ("evictions"); or None if interning is not enabled.
+            """
+            if self._interned is None:
+                return None
+
+            stats = dict(self._interning_stats)
+            total = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = float(stats["hits"]) / total if total else 0.0
+            stats["size"] = len(self._interned)
+            stats["max_size"] = self._interning_max_size
+            return stats
+
+        def _raw_decoder(self):
+            # Returns the function that decodes a raw value, as returned by _raw_values, or None if the column type
+            # does not support interning
+            if self._type in (ProcData.ColumnType.JSON, ProcData.ColumnType.STRING):
+                return _decode_string
+            elif self._type == ProcData.ColumnType.BYTES:
+                return lambda raw: raw
+            elif self._is_char():
+                return _decode_char
+
+            return {
+                ProcData.ColumnType.DATE: _decode_date,
+                ProcData.ColumnType.DATETIME: _decode_datetime,
+                ProcData.ColumnType.DECIMAL: lambda raw: decimal.Decimal(raw).scaleb(-4),
+                ProcData.ColumnType.TIME: _decode_time,
+                ProcData.ColumnType.UUID: lambda raw: uuid.UUID(bytes=raw[15::-1])
+            }.get(self._type, None)
+
+        def _raw_values(self, start, stop):
+            # Returns the raw values of rows start to stop (exclusive, start < stop <= size) as a list: the undecoded
+            # var data values of var-length columns, the data bytes of CHAR and UUID columns, and the packed integers
+            # of others
+            if self._var_type:
+                positions = self._positions(start, stop)
+
+                if self._type == ProcData.ColumnType.BYTES:
+                    return self._decode_bytes(positions)
+                else:
+                    return self._decode_strings(positions, True, False)
+
+            count = stop - start
+            size = self._type_size
+
+            if self._type in (ProcData.ColumnType.DATE, ProcData.ColumnType.TIME):
+                format = "i" if self._type == ProcData.ColumnType.DATE else "I"
+            elif self._type in (ProcData.ColumnType.DATETIME, ProcData.ColumnType.DECIMAL):
+                format = "q"
+            elif size == 1:
+                format = "c"
+            else:
+                format = str(size) + "s"
+
+            return list(_struct(format, count).unpack_from(self._data.data, start * size))
+
+        def _decode_interned(self, start, stop):
+            # Decodes the values of rows start to stop (exclusive, start < stop <= size) into a list, decoding each
+            # distinct raw value once and taking values found in the interning cache from it
+            raw_values = self._raw_values(start, stop)
+            self._set_nulls(raw_values, start, stop)
+            interned = self._interned
+            decode = self._decode_raw
+            max_size = self._interning_max_size
+            decoded = dict.fromkeys(raw_values)
+            misses = 0
+            evictions = 0
+
+            for raw in decoded:
+                if raw is not None:
+                    value = interned.get(raw)
+
+                    if value is None:
+                        value = decode(raw)
+                        misses += 1
+
+                        # Evict as values are added, so that the cache never holds more than max_size values
+                        if len(interned) >= max_size:
+                            interned.popitem(last=False)
+                            evictions += 1
+
+                        interned[raw] = value
+                    else:
+                        interned.move_to_end(raw)
+
+                    decoded[raw] = value
+
+            stats = self._interning_stats
+            stats["hits"] += len(raw_values) - raw_values.count(None) - misses
+            stats["misses"] += misses
+            stats["evictions"] += evictions
+            return list(map(decoded.__getitem__, raw_values))
+
+        def _evict_interned(self):
+            # Drops the least recently used values from the interning cache until it is within its maximum size
+            interned = self._interned
+            excess = len(interned) - self._interning_max_size
+
+            for _ in xrange(0, excess):
+                interned.popitem(last=False)
+
+            if excess > 0:
+                self._interning_stats["evictions"] += excess
+
+        def _enable_metrics(self):
+            # Records the values decoded from the column (see ProcData.enable_metrics), returning the statistics
+            stats = {"rows": 0, "bytes": 0, "seconds": 0.0, "calls": 0, "depth": 0}
+            size = self._type_size
+
+            if self._var_type:
+                _instrument(self, "_decode_var_value", stats, lambda var_data, start, end: (1, size + end - start))
+            else:
+                _instrument(self, "_decode_value", stats, lambda data, index: (1, size))
+
+            for name in ("_decode_interned", "_decode_range", "_to_arrow"):
+                _instrument(self, name, stats, self._range_size)
+
+            for name in ("_to_numpy", "_to_pandas"):
+                _instrument(self, name, stats, lambda rows, *args: self._range_size(*rows.indices(self._size)[:2]))
+
+            return stats
+
+        def unmap(self):
+            """Close the column files, releasing their mappings and file descriptors, for example once a column of a
+                wide table has been processed. They are mapped again if column data is accessed again. Memory used by
+                NumPy arrays and other views of the column data is released once they are no longer referenced.
+            """
+            for name in ("_data", "_nulls", "_var_data"):
+                self.__dict__.pop(name, None)
+
+        def advise(self, advice, start=0, stop=None):
+            """Give the kernel an access hint for rows start to stop (exclusive) of the column, applied to its data,
+                nulls and var data files, for example "sequential" before a scan of a column that is not yet in
+                memory. Hints are best effort: hints the platform does not support are ignored.
+
+                Args:
+                    advice: The access hint: "normal", "sequential" (read ahead aggressively and drop pages behind),
+                        "random" (do not read ahead), "willneed" (read the rows into memory in the background),
+                        "dontneed" (release the rows from memory; they are read again from the file if accessed)
+                        or "hugepage" (back the mapping with huge pages where supported).
+                    start: The first row the hint applies to.
+                    stop: The row after the last row the hint applies to; the end of the column by default.
+            """
+            if advice not in _advice:
+                raise ValueError("Invalid advice specified: " + str(advice))
+
+            if advice == "dontneed" and not self.is_mapped:
+                return
+
+            for file, file_start, file_stop in self._file_ranges(start, stop):
+                file.advise(advice, file_start, file_stop - file_start)
+
+        def residency(self, start=0, stop=None):
+            """Return the fraction of the memory pages of rows start to stop (exclusive) of the column that are
+                resident in memory, from 0 (cold: reading the rows will fault every page in from storage) to 1.
+                Where the kernel reports page cache residency only for mapped pages, this is the fraction of pages
+                this process has accessed.
+
+                Args:
+                    start: The first row to check.
+                    stop: The row after the last row to check; the end of the column by default.
+
+                Returns:
+                     Fraction of pages resident in memory, or None if this is not supported by the platform.
+            """
+            pages = self._resident_pages(start, stop)
+            return None if pages is None else 1.0 if pages[1] == 0 else float(pages[0]) / pages[1]
+
+        def _resident_pages(self, start, stop):
+            # Returns (resident pages, total pages) for rows start to stop of the column files, or None if not
+            # supported
+            resident = 0
+            total = 0
+
+            for file, file_start, file_stop in self._file_ranges(start, stop):
+                pages = file.resident(file_start, file_stop - file_start)
+
+                if pages is None:
+                    return None
+
+                resident += pages[0]
+                total += pages[1]
+
+            return (resident, total)
+
+        def _file_ranges(self, start, stop):
+            # Returns (file, start, stop) byte ranges of the column files holding rows start to stop
+            start, stop = slice(start, stop).indices(self._size)[:2]
+
+            if start >= stop:
+                return []
+
+            result = [(self._data, start * self._type_size, stop * self._type_size)]
+
+            if self._is_nullable:
+                result.append((self._nulls, start, stop))
+
+            if self._var_type:
+                positions = self._positions(start, stop)
+                result.append((self._var_data, positions[0], positions[-1]))
+
+            return result
+
+        def as_numpy(self):
+            """Access column data as a read-only NumPy array that is a view directly over the memory-mapped column
+                data, without copying or decoding any values. Supported for BOOLEAN, INT8, INT16, INT, LONG, ULONG,
+                FLOAT, DOUBLE and TIMESTAMP columns; TIMESTAMP values are milliseconds since the epoch. The values
+                at null positions are unspecified.
+
+                Returns:
+                     Read-only NumPy array with one element per row of the column.
+            """
+            import numpy as np
+
+            dtype = self._numpy_dtype()
+
+            if dtype is None:
+                raise TypeError("Cannot view column " + self._name + " of type " + str(self._type) + " as NumPy array")
+
+            if self._size == 0:
+                result = np.empty(0, dtype)
+            else:
+                result = np.frombuffer(self._data.data, dtype, self._size)
+
+            result.flags.writeable = False
+            return result
+
+        def as_chars(self, decode=False):
+            """Access CHAR1 to CHAR256 column data as a NumPy array, reversing the stored bytes of all values at
+                once. Values are returned as a fixed-width bytes string array (dtype S1 to S256), or if decode is
+                True, as a fixed-width unicode string array. The values at null positions are unspecified.
+
+                Args:
+                    decode: Whether to decode values into unicode strings rather than returning bytes strings.
+
+                Returns:
+                     NumPy array with one element per row of the column.
+            """
+            if not self._is_char():
+                raise TypeError("Cannot view column " + self._name + " of type " + str(self._type) + " as char array")
+
+            return self._chars(slice(None), decode)
+
+        def _chars(self, rows, decode):
+            import numpy as np
+
+            size = self._type_size
+            dtype = ("U" if decode else "S") + str(size)
+
+            if self._size == 0:
+                return np.empty(0, dtype)
+
+            values = _reverse_items(np.frombuffer(self._data.data, "S" + str(size), self._size)[rows], size)
+
+            if not decode:
+                return values
+
+            # ASCII strings are decoded by widening their bytes to code points
+            codes = values.view(np.uint8)
+
+            if not (codes >= 0x80).any():
+                return codes.astype(np.uint32).view(dtype)
+
+            return np.array([_decode_string(value) for value in values.tolist()], dtype)
+
+        def as_uuid(self, raw=False):
+            """Access UUID column data as a NumPy array. By default values are returned as a bytes string array
+                (dtype S16) of the standard UUID bytes, reversing the stored bytes of all values at once; these can be
+                passed to uuid.UUID(bytes=...). If raw is True, values are returned as a read-only structured view
+                directly over the memory-mapped column data, without copying, with uint64 fields "low" and "high"
+                holding the low and high 64 bits of the 128-bit integer value of each UUID. The values at null
+                positions are unspecified.
+
+                Args:
+                    raw: Whether to return a zero-copy structured view rather than UUID bytes.
+
+                Returns:
+                     NumPy array with one element per row of the column.
+            """
+            import numpy as np
+
+            if self._type != ProcData.ColumnType.UUID:
+                raise TypeError("Cannot view column " + self._name + " of type " + str(self._type) + " as UUID array")
+
+            dtype = _uuid_dtype() if raw else "S16"
+
+            if self._size == 0:
+                return np.empty(0, dtype)
+
+            values = np.frombuffer(self._data.data, _uuid_dtype(), self._size)
+
+            if not raw:
+                return _reverse_items(values, 16)
+
+            values.flags.writeable = False
+            return values
+
+        def as_ipv4(self):
+            """Access IPV4 column data as a read-only NumPy uint32 array that is a view directly over the
+                memory-mapped column data, without copying. Each value is the address as an unsigned integer, as
+                returned by int(ipaddress.IPv4Address(...)). The values at null positions are unspecified.
+
+                Returns:
+                     Read-only NumPy uint32 array with one element per row of the column.
+            """
+            import numpy as np
+
+            if self._type != ProcData.ColumnType.IPV4:
+                raise TypeError("Cannot view column " + self._name + " of type " + str(self._type) + " as IPv4 array")
+
+            if self._size == 0:
+                result = np.empty(0, "=u4")
+            else:
+                result = np.frombuffer(self._data.data, "=u4", self._size)
+
+            result.flags.writeable = False
+            return result
+
+        def ipv4_lookup(self, networks):
+            """Find the network containing the address of each row of an IPV4 column, checking all addresses at
+                once. Where networks overlap, the most specific (longest-prefix) network is found.
+
+                Args:
+                    networks: Sequence of networks, as CIDR strings such as "10.0.0.0/8" or ipaddress.IPv4Network
+                        objects. Host bits are ignored.
+
+                Returns:
+                     NumPy int64 array with one element per row of the column, holding the index in networks of the
+                     network containing the address, or -1 if no network contains it or the row is null.
+            """
+            result = _ipv4_lookup_array(self.as_ipv4(), networks)
+
+            if self._is_nullable:
+                result[self.null_mask()] = -1
+
+            return result
+
+        def ipv4_in(self, networks):
+            """Check whether the address of each row of an IPV4 column is in any of the given networks, checking all
+                addresses at once.
+
+                Args:
+                    networks: Sequence of networks, as CIDR strings such as "10.0.0.0/8" or ipaddress.IPv4Network
+                        objects. Host bits are ignored.
+
+                Returns:
+                     NumPy boolean array with one element per row of the column, True where the address is in any
+                     of the networks (False for null rows).
+            """
+            return self.ipv4_lookup(networks) >= 0
+
+        def as_matrix(self):
+            """Access VECTOR column data as a two-dimensional NumPy float32 array with one row per row of the
+                column, if all vectors have the same dimension. If the column has no nulls, the array is a read-only
+                view directly over the memory-mapped var data, without copying; otherwise it is a copy with null
+                rows filled with NaN. If the vectors differ in dimension (or null rows have values), a
+                one-dimensional object array is returned instead, holding a float32 array view of each vector, or
+                None for null rows; as_ragged() gives the same data as flat values and offsets.
+
+                Returns:
+                     NumPy float32 array of shape (rows, dimension), or NumPy object array of shape (rows,) if the
+                     vectors differ in dimension.
+            """
+            import numpy as np
+
+            values, offsets = self.as_ragged()
+            size = self._size
+            lengths = np.diff(offsets)
+            mask = self.null_mask() if self._is_nullable else None
+
+            if mask is not None and not mask.any():
+                mask = None
+
+            valid = lengths if mask is None else lengths[~mask]
+            dimension = int(valid[0]) if len(valid) > 0 else 0
+
+            if (valid != dimension).any() or (mask is not None and lengths[mask].any()):
+                result = np.empty(size, object)
+
+                for i in xrange(0, size):
+                    if mask is None or not mask[i]:
+                        result[i] = values[offsets[i]:offsets[i + 1]]
+
+                return result
+
+            start = int(offsets[0]) if size > 0 else 0
+            matrix = values[start:start + len(valid) * dimension].reshape(len(valid), dimension)
+
+            if mask is None:
+                return matrix
+
+            result = np.full((size, dimension), np.nan, np.float32)
+            result[~mask] = matrix
+            return result
+
+        def as_ragged(self, dtype=None):
+            """Access VECTOR or ARRAY column data as a flat NumPy array of the values of all rows and an array of
+                offsets into it. The values of row i are values[offsets[i]:offsets[i + 1]]; null rows have no
+                values. For a VECTOR column, the values are a read-only float32 view directly over the memory-mapped
+                var data, without copying. For an ARRAY column, the JSON data of all rows is parsed at once.
+
+                Args:
+                    dtype: NumPy dtype to convert the values to; by default VECTOR values are float32, and the dtype
+                        of ARRAY values is inferred from the values.
+
+                Returns:
+                     Tuple of (values, offsets), where offsets is a NumPy int64 array with one more element than
+                     the number of rows of the column.
+            """
+            import numpy as np
+
+            if self._type not in (ProcData.ColumnType.ARRAY, ProcData.ColumnType.VECTOR):
+                raise TypeError("Cannot view column " + self._name + " of type " + str(self._type) + " as ragged array")
+
+            var_size = self._var_data.size
+            positions = np.empty(self._size + 1, np.int64)
+
+            if self._size > 0:
+                positions[:-1] = np.frombuffer(self._data.data, "=i8", self._size)
+
+            positions[-1] = var_size
+
+            if self._type == ProcData.ColumnType.ARRAY:
+                if self._size > 0 and var_size > 0 and _numeric_array_table is not None:
+                    values, counts = _parse_numeric_arrays(self._var_data.data[positions[0]:positions[-1]], np.diff(positions))
+
+                    if values is not None:
+                        offsets = np.zeros(self._size + 1, np.int64)
+                        np.cumsum(counts, out=offsets[1:])
+                        return (values if dtype is None else values.astype(dtype)), offsets
+
+                arrays = self._decode_range(0, self._size) if self._size > 0 else []
+                offsets = np.zeros(self._size + 1, np.int64)
+                np.cumsum([0 if array is None else len(array) for array in arrays], out=offsets[1:])
+                values = list(itertools.chain.from_iterable(array for array in arrays if array is not None))
+
+                if dtype is None and any(isinstance(value, (list, dict)) for value in values):
+                    return np.fromiter(values, object, len(values)), offsets
+
+                return np.array(values, dtype), offsets
+
+            if var_size == 0:
+                values = np.empty(0, "=f4")
+            else:
+                values = np.frombuffer(self._var_data.data, "=f4", var_size // 4)
+
+            offsets = positions // 4
+
+            if dtype is not None:
+                return values.astype(dtype), offsets
+
+            values.flags.writeable = False
+            return values, offsets
+
+        def as_datetime64(self):
+            """Access DATE, DATETIME, TIME or TIMESTAMP column data as a NumPy array, decoding all values at once.
+                DATE values are returned as datetime64[D], DATETIME as datetime64[ms], and TIME as timedelta64[ms]
+                since midnight. TIMESTAMP values are returned as a read-only datetime64[ms] view directly over the
+                memory-mapped column data, without copying. The values at null positions are unspecified.
+
+                Returns:
+                     NumPy array with one element per row of the column.
+            """
+            return self._datetime64(slice(None))
+
+        def _datetime64(self, rows):
+            import numpy as np
+
+            storage = {
+                ProcData.ColumnType.DATE:      ("=i4", _decode_date_array),
+                ProcData.ColumnType.DATETIME:  ("=i8", _decode_datetime_array),
+                ProcData.ColumnType.TIME:      ("=u4", _decode_time_array),
+                ProcData.ColumnType.TIMESTAMP: ("=i8", None)
+            }.get(self._type, None)
+
+            if storage is None:
+                raise TypeError("Cannot view column " + self._name + " of type " + str(self._type) + " as datetime64 array")
+
+            dtype, decode = storage
+
+            if self._size == 0:
+                values = np.empty(0, dtype)
+            else:
+                values = np.frombuffer(self._data.data, dtype, self._size)[rows]
+
+            if decode is not None:
+                return decode(values)
+
+            result = values.view("M8[ms]")
+            result.flags.writeable = False
+            return result
+
+        def as_decimal(self):
+            """Access DECIMAL column data as a DecimalArray whose unscaled int64 values are a read-only view directly
+                over the memory-mapped column data, without copying or creating Decimal objects. The values at null
+                positions are unspecified.
+
+                Returns:
+                     DecimalArray with scale 4 and one element per row of the column.
+            """
+            import numpy as np
+
+            if self._type != ProcData.ColumnType.DECIMAL:
+                raise TypeError("Cannot view column " + self._name + " of type " + str(self._type) + " as decimal array")
+
+            if self._size == 0:
+                values = np.empty(0, "=i8")
+            else:
+                values = np.frombuffer(self._data.data, "=i8", self._size)
+
+            values.flags.writeable = False
+            return ProcData.DecimalArray(values)
+
+        def null_mask(self):
+            """Access the null flags of the column as a read-only NumPy boolean array that is a view directly over
+                the memory-mapped null data, without copying. For a non-nullable column an all-False array is
+                returned.
+
+                Returns:
+                     Read-only NumPy boolean array with one element per row of the column, True where the row is null.
+            """
+            import numpy as np
+
+            if not self._is_nullable or self._size == 0:
+                result = np.zeros(self._size, "?")
+            else:
+                result = np.frombuffer(self._nulls.data, "?", self._size)
+
+            result.flags.writeable = False
+            return result
+
+        def as_masked(self):
+            """Access column data as a read-only NumPy masked array combining as_numpy() and null_mask(), with null
+                rows masked. Neither the values nor the mask are copied. Supported for the same column types as
+                as_numpy().
+
+                Returns:
+                     Read-only NumPy masked array with one element per row of the column.
+            """
+            import numpy as np
+
+            values = self.as_numpy()
+
+            if not self._is_nullable:
+                return np.ma.masked_array(values, copy=False)
+
+            return np.ma.masked_array(values, mask=self.null_mask(), copy=False)
+
+        def to_arrow(self):
+            """Access column data as an Apache Arrow array. Fixed-width numeric and TIMESTAMP data, BYTES data and
+                VECTOR data are wrapped directly over the memory-mapped column files without copying; other types
+                are converted in bulk. STRING and JSON columns are returned as large_string, BYTES as large_binary,
+                VECTOR as large_list<float32>, DECIMAL as decimal128(18, 4), UUID as fixed_size_binary(16) and
+                IPV4 as uint32. Nulls are returned as an Arrow validity bitmap.
+
+                Returns:
+                     PyArrow Array with one element per row of the column.
+            """
+            return self._to_arrow(0, self._size)
+
+        def _to_arrow(self, start, stop):
+            import numpy as np
+            import pyarrow as pa
+
+            column_type = self._type
+            size = stop - start
+            rows = slice(start, stop)
+
+            if self._is_nullable and size > 0:
+                mask = self.null_mask()[rows]
+                null_count = int(np.count_nonzero(mask))
+            else:
+                mask = None
+                null_count = 0
+
+            if null_count > 0:
+                validity = pa.py_buffer(np.packbits(~mask, bitorder="little"))
+            else:
+                mask = None
+                validity = None
+
+            if column_type == ProcData.ColumnType.ARRAY:
+                return pa.array(self[rows])
+
+            if self._var_type:
+                var_data = self._var_data
+                var_size = var_data.size
+                var_buffer = pa.py_buffer(var_data.data if var_size > 0 else b"")
+                offsets = np.empty(size + 1, np.int64)
+
+                if size > 0:
+                    offsets[:size] = np.frombuffer(self._data.data, "=i8", self._size)[rows]
+
+                offsets[size] = var_size if stop >= self._size else _uint64_struct.unpack_from(self._data.data, stop * 8)[0]
+
+                if column_type == ProcData.ColumnType.BYTES:
+                    return pa.Array.from_buffers(pa.large_binary(), size, [validity, pa.py_buffer(offsets), var_buffer], null_count)
+
+                if column_type == ProcData.ColumnType.VECTOR:
+                    values = pa.Array.from_buffers(pa.float32(), var_size // 4, [None, var_buffer])
+                    return pa.Array.from_buffers(pa.large_list(pa.float32()), size, [validity, pa.py_buffer(offsets // 4)], null_count, children=[values])
+
+                # Strip the null terminator from each non-null value so that values are contiguous
+                first = int(offsets[0])
+                offsets -= first
+                terminated = offsets[1:] > offsets[:-1]
+                keep = np.ones(int(offsets[-1]), "?")
+                keep[offsets[1:][terminated] - 1] = False
+                offsets[1:] -= np.cumsum(terminated)
+                values = np.frombuffer(var_buffer, np.uint8, len(keep), first)[keep]
+                return pa.Array.from_buffers(pa.large_string(), size, [validity, pa.py_buffer(offsets), pa.py_buffer(values)], null_count)
+
+            arrow_type = {
+                ProcData.ColumnType.DOUBLE:    pa.float64(),
+                ProcData.ColumnType.FLOAT:     pa.float32(),
+                ProcData.ColumnType.INT:       pa.int32(),
+                ProcData.ColumnType.INT8:      pa.int8(),
+                ProcData.ColumnType.INT16:     pa.int16(),
+                ProcData.ColumnType.IPV4:      pa.uint32(),
+                ProcData.ColumnType.LONG:      pa.int64(),
+                ProcData.ColumnType.TIMESTAMP: pa.timestamp("ms"),
+                ProcData.ColumnType.ULONG:     pa.uint64()
+            }.get(column_type, None)
+
+            if arrow_type is not None:
+                if size == 0:
+                    return pa.array([], arrow_type)
+
+                type_size = self._type_size
+                data = pa.py_buffer(memoryview(self._data.data)[start * type_size:stop * type_size])
+                return pa.Array.from_buffers(arrow_type, size, [validity, data], null_count)
+
+            if column_type == ProcData.ColumnType.BOOLEAN:
+                return pa.array(self.as_numpy()[rows], pa.bool_(), mask=mask)
+
+            if column_type in (ProcData.ColumnType.DATE, ProcData.ColumnType.DATETIME, ProcData.ColumnType.TIME):
+                arrow_type, dtype = {
+                    ProcData.ColumnType.DATE:     (pa.date32(), np.int32),
+                    ProcData.ColumnType.DATETIME: (pa.timestamp("ms"), np.int64),
+                    ProcData.ColumnType.TIME:     (pa.time32("ms"), np.int32)
+                }[column_type]
+
+                values = self._datetime64(rows).astype(dtype)
+            elif column_type == ProcData.ColumnType.DECIMAL:
+                arrow_type = pa.decimal128(18, 4)
+                unscaled = self.as_decimal().values[rows]
+                values = np.empty((size, 2), "<i8")
+                values[:, 0] = unscaled
+                values[:, 1] = unscaled >> 63
+            elif column_type == ProcData.ColumnType.UUID:
+                arrow_type = pa.binary(16)
+                raw = np.frombuffer(self._data.data, "S16", size, start * 16) if size > 0 else np.empty(0, "S16")
+                values = _reverse_items(raw, 16)
+            else:
+                values = self._chars(rows, False)
+                return pa.array(values, pa.binary(), mask=mask).cast(pa.string())
+
+            return pa.Array.from_buffers(arrow_type, size, [validity, pa.py_buffer(np.ascontiguousarray(values))], null_count)
+
+        def _numpy_values(self, rows):
+            # Returns the values of the given rows as a NumPy array (see InputTable.to_df for the conversion of each
+            # column type) and their null mask, or None for the mask if the column is not nullable; returns
+            # (None, None) if the column type has no NumPy representation
+            column_type = self._type
+
+            if column_type == ProcData.ColumnType.DECIMAL:
+                values = self.as_decimal()[rows].to_float()
+            elif column_type in (ProcData.ColumnType.DATE, ProcData.ColumnType.DATETIME, ProcData.ColumnType.TIME):
+                values = self._datetime64(rows)
+            elif self._numpy_dtype() is not None:
+                values = self.as_numpy()[rows]
+            else:
+                return None, None
+
+            return values, self.null_mask()[rows] if self._is_nullable else None
+
+        def _to_numpy(self, rows):
+            # Returns the values of the given rows as a NumPy array, masked if the column is nullable, or as an
+            # object array of decoded values if the column type has no NumPy representation or, for DECIMAL, no
+            # exact one
+            import numpy as np
+
+            if self._type == ProcData.ColumnType.DECIMAL:
+                values, mask = None, None
+            else:
+                values, mask = self._numpy_values(rows)
+
+            if values is None:
+                decoded = self[rows]
+                values = np.empty(len(decoded), object)
+                values[:] = decoded
+                return values
+
+            if mask is None:
+                return values
+
+            return np.ma.masked_array(values, mask=mask, copy=False)
+
+        def _to_pandas(self, rows, zero_copy, dtype_backend):
+            # Returns the values of the given rows as an array suitable for a Pandas data frame column
+            import numpy as np
+            import pandas as pd
+
+            if dtype_backend == "pyarrow":
+                import pyarrow as pa
+
+                start, stop, step = rows.indices(self._size)
+                array = self._to_arrow(start, max(start, stop)) if step == 1 else self.to_arrow()[rows]
+                return pd.arrays.ArrowExtensionArray(pa.chunked_array([array]))
+
+            if self._type == ProcData.ColumnType.DECIMAL:
+                # Decimal objects keep DECIMAL values exact, which float64 cannot
+                return self[rows]
+
+            values, mask = self._numpy_values(rows)
+
+            if values is None:
+                return self[rows]
+
+            if not zero_copy and not values.flags.writeable:
+                values = values.copy()
+
+            if mask is None:
+                return values
+
+            kind = values.dtype.kind
+
+            if dtype_backend == "numpy_nullable" and kind in "biuf":
+                array_class = {"b": pd.arrays.BooleanArray, "f": pd.arrays.FloatingArray}.get(kind, pd.arrays.IntegerArray)
+                return array_class(values, mask.copy())
+
+            if not mask.any():
+                return values
+
+            if kind in "Mm":
+                values = values.copy()
+                values[mask] = np.datetime64("NaT") if kind == "M" else np.timedelta64("NaT")
+                return values
+
+            # Integers are only converted to float64 (so that nulls can be NaN) where that is exact
+            if kind == "f" or kind in "iu" and not ((values[~mask] > 2 ** 53) | (values[~mask] < -2 ** 53)).any():
+                return np.where(mask, np.nan, values)
+
+            values = values.astype(object)
+            values[mask] = None
+            return values
+
+
+    class OutputColumn(Column):
         def __init__(self, file):
             super(ProcData.OutputColumn, self).__init__(file, True)
             self._pos = 0
+            self._auto_grow = False
 
             if not self._var_type:
-                self._encode_value = {
-                    ProcData.ColumnType.BOOLEAN: lambda data, index, value: _bool_struct.pack_into(data, index, value),
-                    ProcData.ColumnType.CHAR1: lambda data, index, value: _char1_struct.pack_into(data, index, _encode_char(value, 1)),
-                    ProcData.ColumnType.CHAR2: lambda data, index, value: _char2_struct.pack_into(data, index * 2, _encode_char(value, 2)),
-                    ProcData.ColumnType.CHAR4: lambda data, index, value: _char4_struct.pack_into(data, index * 4, _encode_char(value, 4)),
-                    ProcData.ColumnType.CHAR8: lambda data, index, value: _char8_struct.pack_into(data, index * 8, _encode_char(value, 8)),
-                    ProcData.ColumnType.CHAR16: lambda data, index, value: _char16_struct.pack_into(data, index * 16, _encode_char(value, 16)),
-                    ProcData.ColumnType.CHAR32: lambda data, index, value: _char32_struct.pack_into(data, index * 32, _encode_char(value, 32)),
-                    ProcData.ColumnType.CHAR64: lambda data, index, value: _char64_struct.pack_into(data, index * 64, _encode_char(value, 64)),
-                    ProcData.ColumnType.CHAR128: lambda data, index, value: _char128_struct.pack_into(data, index * 128, _encode_char(value, 128)),
-                    ProcData.ColumnType.CHAR256: lambda data, index, value: _char256_struct.pack_into(data, index * 256, _encode_char(value, 256)),
-                    ProcData.ColumnType.DATE: lambda data, index, value: _int32_struct.pack_into(data, index * 4, _encode_date(value)),
-                    ProcData.ColumnType.DATETIME: lambda data, index, value: _int64_struct.pack_into(data, index * 8, _encode_datetime(value)),
-                    ProcData.ColumnType.DECIMAL: lambda data, index, value: _int64_struct.pack_into(data, index * 8, long(value * 10000)),
-                    ProcData.ColumnType.DOUBLE: lambda data, index, value: _double_struct.pack_into(data, index * 8, value),
-                    ProcData.ColumnType.FLOAT: lambda data, index, value: _float_struct.pack_into(data, index * 4, value),
-                    ProcData.ColumnType.INT: lambda data, index, value: _int32_struct.pack_into(data, index * 4, int(value)),
-                    ProcData.ColumnType.INT8: lambda data, index, value: _int8_struct.pack_into(data, index, int(value)),
-                    ProcData.ColumnType.INT16: lambda data, index, value: _int16_struct.pack_into(data, index * 2, int(value)),
-                    ProcData.ColumnType.IPV4: lambda data, index, value: _int32_struct.pack_into(data, index * 4, int(value)),
-                    ProcData.ColumnType.LONG: lambda data, index, value: _int64_struct.pack_into(data, index * 8, long(value)),
-                    ProcData.ColumnType.TIME: lambda data, index, value: _uint32_struct.pack_into(data, index * 4, _encode_time(value)),
-                    ProcData.ColumnType.TIMESTAMP: lambda data, index, value: _int64_struct.pack_into(data, index * 8, long(value)),
-                    ProcData.ColumnType.ULONG: lambda data, index, value: _uint64_struct.pack_into(data, index * 8, long(value)),
-                    ProcData.ColumnType.UUID: lambda data, index, value: _char16_struct.pack_into(data, index * 16, value.bytes[15::-1])
-                }[self._type]
+                codec = _codecs[self._type]
+                self._encode_value = codec.encode_one
+                self._encode_many = codec.encode_many
+
+        def _array_encoder(self):
+            # Returns (storage dtype, vectorized encoder, NumPy dtype kinds accepted by the encoder) for column
+            # types whose values are converted when written from arrays, otherwise None
+            if self._is_char():
+                size = self._type_size
+                return "S" + str(size), lambda values: _encode_char_array(values, size), "SU"
+
+            return {
+                ProcData.ColumnType.DATE:      ("=i4", _encode_date_array, "M"),
+                ProcData.ColumnType.DATETIME:  ("=i8", _encode_datetime_array, "M"),
+                ProcData.ColumnType.DECIMAL:   ("=i8", _encode_decimal_array, "iuf"),
+                ProcData.ColumnType.IPV4:      ("=u4", _encode_ipv4_array, "iu"),
+                ProcData.ColumnType.TIME:      ("=u4", _encode_time_array, "m"),
+                ProcData.ColumnType.TIMESTAMP: ("=i8", _encode_timestamp_array, "M"),
+                ProcData.ColumnType.UUID:      ("S16", _encode_uuid_array, "SV")
+            }.get(self._type, None)
+
+        def _as_array(self, value):
+            # Returns value as a one-dimensional NumPy array (or DecimalArray) if it is a NumPy array or supports
+            # the buffer protocol and can be written to this column in bulk, otherwise None (in which case values
+            # must be encoded one at a time)
+            if isinstance(value, ProcData.DecimalArray):
+                return value if self._type == ProcData.ColumnType.DECIMAL else None
+
+            np = sys.modules.get("numpy")
+            encoder = self._array_encoder()
+
+            if np is not None and isinstance(value, np.ndarray):
+                array = value
+            elif self._numpy_dtype() is None and encoder is None:
+                return None
+            else:
+                try:
+                    view = memoryview(value)
+                except TypeError:
+                    return None
+
+                import numpy as np
+
+                array = np.asarray(view)
+
+            if array.ndim != 1:
+                return None
+
+            kind = array.dtype.kind
+
+            if encoder is not None and kind in encoder[2]:
+                return array
+            elif kind in "biuf" and self._numpy_dtype() is not None:
+                return array
+            else:
+                return None
+
+        def _encode_array(self, array):
+            # Returns (storage dtype, values to store, null mask or None) for an array accepted by _as_array
+            import numpy as np
+
+            if isinstance(array, ProcData.DecimalArray):
+                return "=i8", array.rescale(4).values, None
+
+            if isinstance(array, np.ma.MaskedArray):
+                mask = np.ma.getmaskarray(array)
+
+                # Structured arrays (such as raw UUIDs) have a mask per field; a row is null if any field is masked
+                if mask.dtype.names is not None:
+                    mask = np.logical_or.reduce([mask[name] for name in mask.dtype.names])
+                array = np.ma.getdata(array)
+            else:
+                mask = None
+
+            encoder = self._array_encoder()
+            kind = array.dtype.kind
+
+            if encoder is None or kind not in encoder[2]:
+                return self._numpy_dtype(), array, mask
+
+            if kind in "Mm":
+                invalid = np.isnat(array)
+            elif kind == "f":
+                invalid = np.isnan(array)
+            else:
+                invalid = None
+
+            if invalid is not None:
+                mask = invalid if mask is None else mask | invalid
+
+            values = encoder[1](array)
+
+            # Null rows are stored as zero rather than whatever NaT or NaN encodes to, which may not be valid
+            if mask is not None and values.dtype.kind in "iu" and mask.any():
+                values = np.where(mask, 0, values)
+
+            return encoder[0], values, mask
+
+        def _checked_array(self, values, dtype, mask):
+            # Returns values to be stored as dtype, raising as encoding them one at a time would if any cannot be
+            # stored as their integer part (integer columns) or at all (FLOAT columns), rather than letting NumPy
+            # wrap or clamp them; the values of null rows are not checked, and are stored as zero
+            import numpy as np
+
+            kind = values.dtype.kind
+
+            if kind not in "iuf" or dtype.kind not in "iuf" or np.can_cast(values.dtype, dtype, "safe"):
+                return values
+
+            checked = values if mask is None else values[~mask]
+
+            if dtype.kind in "iu":
+                info = np.iinfo(dtype)
+
+                if kind == "f":
+                    if not np.isfinite(checked).all():
+                        raise ValueError("Cannot convert NaN or infinite value to integer in column " + self._name)
+
+                    invalid = (checked < float(info.min)) | (checked >= float(info.max) + 1)
+
+                    if mask is not None:
+                        values = np.where(mask, 0, values)
+                else:
+                    invalid = (checked < info.min) | (checked > info.max)
+            else:
+                invalid = np.abs(checked) > np.finfo(dtype).max
+                invalid &= np.isfinite(checked)
+
+                if invalid.any():
+                    raise OverflowError("Value too large for column " + self._name + ": " + str(checked[invalid][0]))
+
+            if invalid.any():
+                raise struct.error("Value out of range for column " + self._name + ": " + str(checked[invalid][0]))
+
+            return values
+
+        def _write_array(self, index, array):
+            import numpy as np
+
+            size = self._size
+
+            if size == 0:
+                if len(xrange(*index.indices(size))) != len(array):
+                    raise IndexError("Incorrect slice assignment size")
+
+                return
+
+            dtype, values, mask = self._encode_array(array)
+
+            if mask is not None and not self._is_nullable and mask.any():
+                raise ValueError("Cannot assign null values to non-nullable column " + self._name)
+
+            target = np.frombuffer(self._data.data, dtype, size)[index]
+
+            if len(target) != len(values):
+                raise IndexError("Incorrect slice assignment size")
+
+            target[:] = self._checked_array(values, target.dtype, mask)
+
+            if self._is_nullable:
+                np.frombuffer(self._nulls.data, "?", size)[index] = 0 if mask is None else mask
 
         def __setitem__(self, index, value):
             if self._var_type:
                 raise RuntimeError("Cannot set values in variable-length column")
 
             if isinstance(index, slice):
+                array = self._as_array(value)
+
+                if array is not None:
+                    self._write_array(index, array)
+                    return
+
                 data = self._data.data
                 encode_value = self._encode_value
                 ii = iter(xrange(*index.indices(self._size)))
@@ -655,106 +2346,590 @@ class ProcData(_SingletonType("_Singleton", (object,), {})):
                 else:
                     self._encode_value(self._data.data, index, value)
             else:
-                raise TypeError("Invalid index specified: " + str(index))
+                raise TypeError("Invalid index specified: " + str(index))
+
+        def append(self, value):
+            index = self._pos
+
+            if index >= self._size:
+                self._grow(index + 1)
+
+            if not self._var_type:
+                if self._is_nullable:
+                    if value is None:
+                        self._nulls.data[index] = _null
+                    else:
+                        self._nulls.data[index] = _not_null
+                        self._encode_value(self._data.data, index, value)
+                else:
+                    self._encode_value(self._data.data, index, value)
+            else:
+                var_data = self._var_data
+                _uint64_struct.pack_into(self._data.data, index * 8, var_data.pos)
+
+                if self._is_nullable:
+                    if value is None:
+                        self._nulls.data[index] = _null
+                    else:
+                        self._nulls.data[index] = _not_null
+                        self._encode_var_value(var_data, value)
+                else:
+                    self._encode_var_value(var_data, value)
+
+            self._pos += 1
+            return index
+
+        def extend(self, values):
+            index = self._pos
+
+            if self._auto_grow:
+                if not hasattr(values, "__len__"):
+                    values = list(values)
+
+                if index + len(values) > self._size:
+                    self._grow(index + len(values))
+
+            data = self._data.data
+            size = self._size
+
+            if not self._var_type:
+                array = self._as_array(values)
+
+                if array is not None:
+                    count = min(len(array), max(size - index, 0))
+                    self._write_array(slice(index, index + count), array[:count])
+                    self._pos = index + count
+
+                    if count < len(array):
+                        raise IndexError("Insufficient table size")
+
+                    return index + count - 1
+            elif self._type == ProcData.ColumnType.VECTOR:
+                np = sys.modules.get("numpy")
+
+                if np is not None and isinstance(values, np.ndarray) and values.ndim == 2 and values.dtype.kind in "iuf":
+                    return self._extend_matrix(values)
+
+            try:
+                if not self._var_type:
+                    encode_value = self._encode_value
+
+                    if self._is_nullable:
+                        nulls = self._nulls.data
+
+                        for value in values:
+                            if index >= size:
+                                raise IndexError("Insufficient table size")
+                            elif value is None:
+                                nulls[index] = _null
+                            else:
+                                nulls[index] = _not_null
+                                encode_value(data, index, value)
+
+                            index += 1
+                    else:
+                        if isinstance(values, (list, tuple)) and 0 < len(values) <= size - index:
+                            # Encode all values at once; values that cannot be are encoded one at a time below, which
+                            # converts or reports them individually
+                            try:
+                                self._encode_many(data, index, values)
+                                index += len(values)
+                                values = ()
+                            except (struct.error, TypeError, ValueError, AttributeError, OverflowError):
+                                pass
+
+                        for value in values:
+                            if index >= size:
+                                raise IndexError("Insufficient table size")
+                            else:
+                                encode_value(data, index, value)
+
+                            index += 1
+                else:
+                    var_data = self._var_data
+                    encode_var_value = self._encode_var_value
+
+                    if self._is_nullable:
+                        nulls = self._nulls.data
+
+                        for value in values:
+                            if index >= size:
+                                raise IndexError("Insufficient table size")
+                            else:
+                                _uint64_struct.pack_into(data, index * 8, var_data.pos)
+
+                                if value is None:
+                                    nulls[index] = _null
+                                else:
+                                    nulls[index] = _not_null
+                                    encode_var_value(var_data, value)
+
+                            index += 1
+                    else:
+                        for value in values:
+                            if index >= size:
+                                raise IndexError("Insufficient table size")
+                            else:
+                                _uint64_struct.pack_into(data, index * 8, var_data.pos)
+                                encode_var_value(var_data, value)
+
+                            index += 1
+            finally:
+                self._pos = index
+
+            return index - 1
+
+        def extend_ragged(self, values, offsets, mask=None):
+            """Append rows to a VECTOR or ARRAY column from a flat array of the values of all rows and an array of
+                offsets into it, as returned by InputColumn.as_ragged(), writing them in bulk. For an ARRAY column,
+                the JSON text of all values is generated at once.
+
+                Args:
+                    values: One-dimensional NumPy array of the values of all rows.
+                    offsets: One-dimensional array of offsets into values with one more element than the number of
+                        rows to append; the values of row i are values[offsets[i]:offsets[i + 1]].
+                    mask: Optional boolean array with one element per row to append, True where the row is null.
+
+                Returns:
+                     Index of the last row appended.
+            """
+            import numpy as np
+
+            if self._type not in (ProcData.ColumnType.ARRAY, ProcData.ColumnType.VECTOR):
+                raise TypeError("Cannot write ragged array to column " + self._name + " of type " + str(self._type))
+
+            values = np.asarray(values)
+            offsets = np.asarray(offsets, np.int64)
+
+            if values.ndim != 1 or offsets.ndim != 1 or len(offsets) == 0:
+                raise ValueError("Invalid ragged array shape")
+
+            count = len(offsets) - 1
+            index = self._pos
+
+            if mask is not None:
+                mask = np.asarray(mask, "?")
+
+                if len(mask) != count:
+                    raise ValueError("Invalid ragged array mask size: " + str(len(mask)))
+
+                if not mask.any():
+                    mask = None
+                elif not self._is_nullable:
+                    raise ValueError("Cannot assign null values to non-nullable column " + self._name)
+
+            if count > self._size - index:
+                self._grow(index + count)
+
+            if count == 0:
+                return index - 1
+
+            values = values[offsets[0]:offsets[-1]]
+            offsets = offsets - offsets[0]
+
+            if self._type == ProcData.ColumnType.ARRAY:
+                tokens = _json_tokens(values)
+                offsets = offsets.tolist()
+                encoded = [_encode_string("[" + ",".join(tokens[offsets[i]:offsets[i + 1]]) + "]")
+                           for i in xrange(0, count) if mask is None or not mask[i]]
+                self._extend_var_encoded(encoded, mask)
+                return index + count - 1
+
+            var_data = self._var_data
+            np.frombuffer(self._data.data, "=u8", self._size)[index:index + count] = var_data.pos + offsets[:-1] * 4
+            var_data.write(np.ascontiguousarray(values, "=f4").view(np.uint8))
+
+            if self._is_nullable:
+                np.frombuffer(self._nulls.data, "?", self._size)[index:index + count] = 0 if mask is None else mask
+
+            self._pos = index + count
+            return index + count - 1
+
+        def fill(self, value):
+            """Set every row of a fixed-width column to the same value (or to null, if value is None and the
+                column is nullable). The value is encoded once and replicated across the column in bulk.
+
+                Args:
+                    value: The value to assign to all rows of the column.
+            """
+            if self._var_type:
+                raise RuntimeError("Cannot set values in variable-length column")
+
+            size = self._size
+
+            if size == 0:
+                return
+
+            if self._is_nullable:
+                if value is None:
+                    self._nulls.data[0:size] = b"\x01" * size
+                    return
+
+                self._nulls.data[0:size] = b"\x00" * size
+
+            data = self._data.data
+            type_size = self._type_size
+            self._encode_value(data, 0, value)
+            data[type_size:size * type_size] = data[0:type_size] * (size - 1)
+
+        def char_overflow(self, values):
+            """Find the values of an array of strings that are too long for this CHAR1 to CHAR256 column, checking
+                all values at once. Values longer than the column width (in bytes, after UTF-8 encoding) are
+                truncated when written to the column.
+
+                Args:
+                    values: NumPy array of unicode or bytes strings.
+
+                Returns:
+                     NumPy boolean array with one element per value, True where the value is too long.
+            """
+            import numpy as np
+
+            if not self._is_char():
+                raise TypeError("Column " + self._name + " of type " + str(self._type) + " is not a char column")
+
+            values = np.asarray(values)
+
+            if values.dtype.kind not in "SU":
+                raise TypeError("Invalid char array type: " + str(values.dtype))
+
+            return _char_array_overflow(values, self._type_size)
+
+        def set_null_mask(self, mask):
+            """Set the null flags of every row of a nullable column from a boolean array in a single operation.
+                Rows where mask is True become null; the values of all other rows are left unchanged.
+
+                Args:
+                    mask: Boolean array-like with one element per row of the column.
+            """
+            import numpy as np
+
+            if not self._is_nullable:
+                raise RuntimeError("Cannot set nulls in non-nullable column " + self._name)
+
+            mask = np.asarray(mask, "?")
+            size = self._size
+
+            if mask.shape != (size,):
+                raise IndexError("Incorrect null mask size")
+
+            if size > 0:
+                np.frombuffer(self._nulls.data, "?", size)[:] = mask
+
+        def _rewind(self):
+            self._pos = 0
+
+            if self._var_type:
+                self._var_data.seek(0)
+
+        def _from_arrow(self, array):
+            import pyarrow as pa
+
+            self._rewind()
+
+            for chunk in (array.chunks if isinstance(array, pa.ChunkedArray) else [array]):
+                if len(chunk) > self._size - self._pos:
+                    raise IndexError("Insufficient table size")
+
+                if self._var_type:
+                    self._extend_arrow_var(chunk)
+                else:
+                    self._extend_arrow(chunk)
+
+        def _extend_arrow(self, array):
+            import numpy as np
+
+            values = _arrow_to_numpy(array)
+
+            if values is None or self._as_array(values) is None:
+                self.extend(array.to_pylist())
+                return
+
+            mask = _arrow_null_mask(array)
+
+            if mask is not None and not self._is_nullable:
+                raise ValueError("Cannot assign null values to non-nullable column " + self._name)
+
+            index = slice(self._pos, self._pos + len(array))
+            self._write_array(index, values)
+
+            if mask is not None:
+                np.frombuffer(self._nulls.data, "?", self._size)[index] |= mask
+
+            self._pos = index.stop
+
+        def _extend_arrow_var(self, array):
+            import numpy as np
+            import pyarrow as pa
+
+            arrow_type = array.type
+            size = len(array)
+            offset = array.offset
+            terminated = False
+
+            if self._type in (ProcData.ColumnType.JSON, ProcData.ColumnType.STRING, ProcData.ColumnType.BYTES) \
+                    and (pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)
+                         or pa.types.is_binary(arrow_type) or pa.types.is_large_binary(arrow_type)):
+                offset_dtype = "=i8" if pa.types.is_large_string(arrow_type) or pa.types.is_large_binary(arrow_type) else "=i4"
+                offsets = np.frombuffer(array.buffers()[1], offset_dtype, size + 1, offset * np.dtype(offset_dtype).itemsize).astype(np.int64)
+                values_buffer = array.buffers()[2]
+                item_size = 1
+                terminated = self._type != ProcData.ColumnType.BYTES
+            elif self._type == ProcData.ColumnType.VECTOR and (pa.types.is_list(arrow_type) or pa.types.is_large_list(arrow_type)
+                                                              or pa.types.is_fixed_size_list(arrow_type)) \
+                    and pa.types.is_floating(arrow_type.value_type):
+                if pa.types.is_fixed_size_list(arrow_type):
+                    offsets = (np.arange(size + 1, dtype=np.int64) + offset) * arrow_type.list_size
+                else:
+                    offset_dtype = "=i8" if pa.types.is_large_list(arrow_type) else "=i4"
+                    offsets = np.frombuffer(array.buffers()[1], offset_dtype, size + 1, offset * np.dtype(offset_dtype).itemsize).astype(np.int64)
+
+                child = array.values
+
+                if child.type != pa.float32():
+                    child = child.cast(pa.float32())
+
+                offsets += child.offset
+                values_buffer = child.buffers()[1]
+                item_size = 4
+            else:
+                self.extend(array.to_pylist())
+                return
+
+            mask = _arrow_null_mask(array)
+
+            if mask is not None and not self._is_nullable:
+                raise ValueError("Cannot assign null values to non-nullable column " + self._name)
+
+            if size == 0:
+                return
+
+            start = int(offsets[0]) * item_size
+            values = np.frombuffer(values_buffer, np.uint8, int(offsets[-1]) * item_size - start, start) if values_buffer is not None else np.empty(0, np.uint8)
+            lengths = np.diff(offsets) * item_size
+
+            if terminated:
+                lengths += 1 if mask is None else ~mask
+                ends = np.cumsum(lengths)
+                var_values = np.empty(int(ends[-1]), np.uint8)
+                is_terminator = np.zeros(len(var_values), "?")
+                is_terminator[ends - 1 if mask is None else (ends - 1)[~mask]] = True
+                var_values[~is_terminator] = values
+                var_values[is_terminator] = 0
+            else:
+                ends = np.cumsum(lengths)
+                var_values = values
+
+            var_data = self._var_data
+            index = slice(self._pos, self._pos + size)
+            np.frombuffer(self._data.data, "=u8", self._size)[index] = var_data.pos + ends - lengths
+            var_data.write(var_values)
+
+            if self._is_nullable:
+                np.frombuffer(self._nulls.data, "?", self._size)[index] = 0 if mask is None else mask
+
+            self._pos = index.stop
+
+        def _extend_matrix(self, matrix):
+            # Appends the rows of a two-dimensional array as the vectors of a VECTOR column in bulk
+            import numpy as np
+
+            index = self._pos
+            count = min(len(matrix), max(self._size - index, 0))
+
+            if count > 0:
+                var_data = self._var_data
+                vector_size = matrix.shape[1] * 4
+                np.frombuffer(self._data.data, "=u8", self._size)[index:index + count] = var_data.pos + np.arange(count, dtype=np.uint64) * vector_size
+                var_data.write(np.ascontiguousarray(matrix[:count], "=f4").view(np.uint8).ravel())
+
+                if self._is_nullable:
+                    np.frombuffer(self._nulls.data, "?", self._size)[index:index + count] = 0
+
+                self._pos = index + count
+
+            if count < len(matrix):
+                raise IndexError("Insufficient table size")
+
+            return index + count - 1
+
+        def _from_series(self, series):
+            import numpy as np
+            import pandas as pd
+
+            self._rewind()
+            size = len(series)
+            mask = series.isna().to_numpy()
+            has_nulls = bool(mask.any())
+
+            if has_nulls and not self._is_nullable and self._type not in (ProcData.ColumnType.DOUBLE, ProcData.ColumnType.FLOAT):
+                raise ValueError("Cannot assign null values to non-nullable column " + self._name)
+
+            if isinstance(series.dtype, pd.DatetimeTZDtype):
+                series = series.dt.tz_convert(None)
+
+            dtype = series.dtype
+            numpy_dtype = dtype if isinstance(dtype, np.dtype) else getattr(dtype, "numpy_dtype", None)
+
+            if not self._var_type and numpy_dtype is not None and numpy_dtype.kind in "biufMm":
+                if isinstance(dtype, np.dtype):
+                    values = series.to_numpy()
+                else:
+                    values = series.to_numpy(numpy_dtype, na_value=np.zeros(1, numpy_dtype)[0])
+
+                if self._as_array(values) is not None:
+                    if has_nulls and self._is_nullable:
+                        values = np.ma.masked_array(values, mask)
+
+                    self._write_array(slice(0, size), values)
+                    self._pos = size
+                    return
+
+            if self._var_type and isinstance(series.array, getattr(pd.arrays, "ArrowExtensionArray", ())):
+                # Arrow-backed data (e.g. from to_df(dtype_backend="pyarrow")) is written as Arrow, so that list
+                # values are not converted to NumPy arrays that cannot be encoded
+                import pyarrow as pa
+
+                self._from_arrow(pa.array(series.array))
+                return
+
+            values = series.to_numpy(object)
+
+            if self._is_char():
+                values = np.array([_encode_string(value) for value in (values[~mask] if has_nulls else values)], "S")
+
+                if has_nulls:
+                    encoded = np.zeros(size, values.dtype)
+                    encoded[~mask] = values
+                    values = np.ma.masked_array(encoded, mask)
+
+                self._write_array(slice(0, size), values)
+                self._pos = size
+                return
+
+            if self._type in (ProcData.ColumnType.JSON, ProcData.ColumnType.STRING, ProcData.ColumnType.BYTES):
+                values = values[~mask] if has_nulls else values
+
+                if self._type == ProcData.ColumnType.BYTES:
+                    encoded = list(values)
+                else:
+                    encoded = [_encode_string(value) for value in values]
+
+                self._extend_var_encoded(encoded, mask if has_nulls else None)
+                return
+
+            if has_nulls:
+                values = np.where(mask, None, values)
+
+            if self._var_type:
+                self.extend(values)
+            else:
+                self[0:size] = values
+                self._pos = size
+
+        def _extend_var_encoded(self, encoded, mask=None):
+            # Appends already-encoded values of a STRING, JSON or BYTES column in bulk, with the values of the rows
+            # that are not null given in order if a null mask is specified
+            import numpy as np
+
+            count = len(encoded) if mask is None else len(mask)
+            index = self._pos
+
+            if count > self._size - index:
+                self._grow(index + count)
+
+            if count == 0:
+                return
+
+            terminated = self._type != ProcData.ColumnType.BYTES
+            lengths = np.fromiter(map(len, encoded), np.int64, len(encoded)) + terminated
+
+            if mask is not None:
+                value_lengths = lengths
+                lengths = np.zeros(count, np.int64)
+                lengths[~mask] = value_lengths
+
+            var_data = self._var_data
+            np.frombuffer(self._data.data, "=u8", self._size)[index:index + count] = var_data.pos + np.cumsum(lengths) - lengths
+
+            if terminated:
+                var_data.write(b"\x00".join(encoded), len(encoded) > 0)
+            else:
+                var_data.write(b"".join(encoded))
 
-        def append(self, value):
-            index = self._pos
+            if self._is_nullable:
+                np.frombuffer(self._nulls.data, "?", self._size)[index:index + count] = 0 if mask is None else mask
 
-            if index >= self._size:
-                raise IndexError("Insufficient table size")
+            self._pos = index + count
 
+        def reserve_bytes(self, size):
+            """Reserve space for at least size more bytes of var data in a variable-length column, so that values
+                totalling that size can be appended without growing the var data file again. Disk space for it is
+                allocated up front where supported. The var data file is truncated to the data actually written
+                when output is complete.
+
+                Args:
+                    size: The number of bytes of var data to reserve beyond what has been written.
+            """
             if not self._var_type:
-                if self._is_nullable:
-                    if value is None:
-                        self._nulls.data[index] = _null
-                    else:
-                        self._nulls.data[index] = _not_null
-                        self._encode_value(self._data.data, index, value)
-                else:
-                    self._encode_value(self._data.data, index, value)
-            else:
-                var_data = self._var_data
-                _uint64_struct.pack_into(self._data.data, index * 8, var_data.pos)
+                raise RuntimeError("Cannot reserve var data in fixed-width column")
 
-                if self._is_nullable:
-                    if value is None:
-                        self._nulls.data[index] = _null
-                    else:
-                        self._nulls.data[index] = _not_null
-                        self._encode_var_value(var_data, value)
-                else:
-                    self._encode_var_value(var_data, value)
+            if size < 0:
+                raise ValueError("Invalid size specified: " + str(size))
 
-            self._pos += 1
-            return index
+            self._var_data.reserve(size)
 
-        def extend(self, values):
-            index = self._pos
-            data = self._data.data
-            size = self._size
+        def _enable_metrics(self):
+            # Records the values encoded into the column (see ProcData.enable_metrics), returning the statistics
+            stats = {"seconds": 0.0, "calls": 0, "depth": 0}
 
-            try:
-                if not self._var_type:
-                    encode_value = self._encode_value
+            for name in ("_encode_var_value" if self._var_type else "_encode_value", "append", "extend", "extend_ragged",
+                         "fill", "set_null_mask", "_write_array", "_from_series", "_from_arrow"):
+                _instrument(self, name, stats)
 
-                    if self._is_nullable:
-                        nulls = self._nulls.data
+            return stats
 
-                        for value in values:
-                            if index >= size:
-                                raise IndexError("Insufficient table size")
-                            elif value is None:
-                                nulls[index] = _null
-                            else:
-                                nulls[index] = _not_null
-                                encode_value(data, index, value)
+        def _written_size(self):
+            # Returns (rows, bytes) written to the column files, for ProcData metrics
+            rows = self._pos if self._auto_grow else max(self._pos, self._size)
+            size = rows * self._type_size + (rows if self._is_nullable else 0)
 
-                            index += 1
-                    else:
-                        for value in values:
-                            if index >= size:
-                                raise IndexError("Insufficient table size")
-                            else:
-                                encode_value(data, index, value)
+            if self._var_type and "_var_data" in self.__dict__:
+                size += self._var_data.pos
 
-                            index += 1
-                else:
-                    var_data = self._var_data
-                    encode_var_value = self._encode_var_value
+            return (rows, size)
 
-                    if self._is_nullable:
-                        nulls = self._nulls.data
+        def _complete(self):
+            # Columns never accessed are mapped here, so that their files are created
+            if self._var_type:
+                self._var_data.truncate()
+            elif not self.is_mapped:
+                self._map()
 
-                        for value in values:
-                            if index >= size:
-                                raise IndexError("Insufficient table size")
-                            else:
-                                _uint64_struct.pack_into(data, index * 8, var_data.pos)
+        def _grow(self, size):
+            # Grows an auto-growing column to at least size rows, at least doubling its capacity so that appending
+            # takes amortized constant time; raises IndexError if the column is not auto-growing
+            if not self._auto_grow:
+                raise IndexError("Insufficient table size")
 
-                                if value is None:
-                                    nulls[index] = _null
-                                else:
-                                    nulls[index] = _not_null
-                                    encode_var_value(var_data, value)
+            self._reserve(max(size, self._size * 2, 1024))
 
-                            index += 1
-                    else:
-                        for value in values:
-                            if index >= size:
-                                raise IndexError("Insufficient table size")
-                            else:
-                                _uint64_struct.pack_into(data, index * 8, var_data.pos)
-                                encode_var_value(var_data, value)
+        def _pad(self, size, written):
+            # Sizes an auto-growing column to size rows when output is complete, making rows not written null;
+            # raises ValueError if the column is not nullable, rather than leaving those rows with arbitrary values
+            self._reserve(size)
 
-                            index += 1
-            finally:
-                self._pos = index
+            if written >= size:
+                return
 
-            return index - 1
+            if not self._is_nullable:
+                raise ValueError("Column " + self._name + " has " + str(written) + " rows written but table has "
+                                 + str(size) + " rows")
+
+            self._nulls.data[written:size] = b"\x01" * (size - written)
 
-        def _complete(self):
             if self._var_type:
-                self._var_data.truncate()
+                self._data.data[written * 8:size * 8] = _uint64_struct.pack(self._var_data.pos) * (size - written)
 
         def _reserve(self, size):
             self._data.remap(size * self._type_size)
@@ -764,6 +2939,57 @@ class ProcData(_SingletonType("_Singleton", (object,), {})):
 
             self._size = size
 
+        def _redirect(self, path):
+            # Maps the column to new, empty files whose names start with path, so that a worker process started by
+            # ProcData.parallel_map writes its own output rather than sharing the files of the parent process
+            self._data = _MemoryMappedFile()
+            self._data.map(path + ".data", True)
+
+            if self._is_nullable:
+                self._nulls = _MemoryMappedFile()
+                self._nulls.map(path + ".nulls", True)
+
+            if self._var_type:
+                self._var_data = _MemoryMappedFile()
+                self._var_data.map(path + ".var", True)
+
+            self._size = 0
+            self._pos = 0
+
+        def _merge(self, path, index, count):
+            # Copies count rows written by a worker process to files whose names start with path (see _redirect)
+            # into the column starting at row index; var data is appended, and the positions of the rows offset
+            # by the length of the var data already written
+            if count == 0:
+                return
+
+            type_size = self._type_size
+            source = _MemoryMappedFile()
+            source.map(path + ".data", False)
+            data = source.data[0 : count * type_size]
+
+            if self._var_type:
+                var_source = _MemoryMappedFile()
+                var_source.map(path + ".var", False)
+                var_pos = self._var_data.pos
+                positions_struct = _struct("Q", count)
+                data = positions_struct.pack(*[position + var_pos for position in positions_struct.unpack(data)])
+
+                if var_source.size > 0:
+                    self._var_data.write(var_source.data)
+
+                var_source.unmap()
+
+            self._data.data[index * type_size : (index + count) * type_size] = data
+            source.unmap()
+
+            if self._is_nullable:
+                source.map(path + ".nulls", False)
+                self._nulls.data[index : index + count] = source.data[0 : count]
+                source.unmap()
+
+            self._pos = max(self._pos, index + count)
+
 
     class Table(Sequence):
         def __init__(self, file, column_class):
@@ -797,13 +3023,247 @@ class ProcData(_SingletonType("_Singleton", (object,), {})):
         def __init__(self, file):
             super(ProcData.InputTable, self).__init__(file, ProcData.InputColumn)
 
+        def unmap(self):
+            """Close the files of all columns of the table (see InputColumn.unmap)."""
+            for column in self._columns:
+                column.unmap()
+
+        def advise(self, advice, start=0, stop=None, columns=None):
+            """Give the kernel an access hint for rows start to stop (exclusive) of columns of the table (see
+                InputColumn.advise).
+
+                Args:
+                    advice: The access hint (see InputColumn.advise).
+                    start: The first row the hint applies to.
+                    stop: The row after the last row the hint applies to; the end of the table by default.
+                    columns: Names of the columns the hint applies to; all columns by default.
+            """
+            for column in self._columns if columns is None else [self._column_dict[name] for name in columns]:
+                column.advise(advice, start, self._size if stop is None else stop)
+
+        def residency(self, start=0, stop=None, columns=None):
+            """Return the fraction of the memory pages of rows start to stop (exclusive) of columns of the table
+                that are resident in memory (see InputColumn.residency).
+
+                Args:
+                    start: The first row to check.
+                    stop: The row after the last row to check; the end of the table by default.
+                    columns: Names of the columns to check; all columns by default.
+
+                Returns:
+                     Fraction of pages resident in memory, or None if this is not supported by the platform.
+            """
+            resident = 0
+            total = 0
+
+            for column in self._columns if columns is None else [self._column_dict[name] for name in columns]:
+                pages = column._resident_pages(start, self._size if stop is None else stop)
+
+                if pages is None:
+                    return None
+
+                resident += pages[0]
+                total += pages[1]
+
+            return 1.0 if total == 0 else float(resident) / total
+
+        def to_arrow(self):
+            """Access table data as an Apache Arrow record batch, built from InputColumn.to_arrow() for each column,
+                so that fixed-width, BYTES and VECTOR data is not copied.
+
+                Returns:
+                     PyArrow RecordBatch with one column per table column.
+            """
+            import pyarrow as pa
+
+            return pa.RecordBatch.from_arrays([column.to_arrow() for column in self._columns],
+                                              names=[column.name for column in self._columns])
+
+        def rows(self, columns=None, as_="tuple", chunk_size=1024):
+            """Iterate over the rows of the table. The decoder for the requested columns is set up once, and each
+                chunk of rows is decoded one column at a time in bulk, so that row-wise access costs much less per
+                value than indexing each column for each row.
+
+                Args:
+                    columns: Names of the columns to include, in order; all columns by default.
+                    as_: "tuple" for tuples, "namedtuple" for named tuples with the column names as fields (names
+                        that are not valid identifiers are replaced by positional names), or "dict" for dicts keyed
+                        by column name.
+                    chunk_size: The number of rows decoded at a time.
+
+                Returns:
+                     Iterator over the rows.
+            """
+            if chunk_size <= 0:
+                raise ValueError("Invalid chunk size specified: " + str(chunk_size))
+
+            selected = self._columns if columns is None else [self._column_dict[name] for name in columns]
+            names = [column.name for column in selected]
+            decoders = [column._decode_range for column in selected]
+
+            if as_ == "tuple":
+                make_row = None
+            elif as_ == "namedtuple":
+                make_row = collections.namedtuple("Row", names, rename=True)._make
+            elif as_ == "dict":
+                make_row = lambda values: dict(_izip(names, values))
+            else:
+                raise ValueError("Invalid row type specified: " + str(as_))
+
+            size = self._size
+
+            for start in xrange(0, size, chunk_size):
+                stop = min(start + chunk_size, size)
+                chunk = _izip(*[decode(start, stop) for decode in decoders])
+
+                for row in (chunk if make_row is None else map(make_row, chunk)):
+                    yield row
+
+        def iter_batches(self, batch_size=65536, columns=None, format="numpy", dtype_backend=None, prefetch=True, release=False):
+            """Iterate over the table in batches of consecutive rows, converting only one batch at a time so that
+                tables larger than available memory can be processed. Each batch holds the same rows of all
+                requested columns. The rows of the next batch are read into memory in the background while a batch
+                is processed.
+
+                Args:
+                    batch_size: The maximum number of rows per batch.
+                    columns: Names of the columns to include, in order; all columns by default.
+                    format: "numpy" for dicts of NumPy arrays keyed by column name (masked arrays for nullable
+                        columns with a NumPy representation, object arrays of decoded values for DECIMAL and other
+                        column types), "pandas" for Pandas Data Frames (see to_df) indexed by row number, so that
+                        the batches concatenate to the whole table, or "arrow" for PyArrow RecordBatches (see
+                        to_arrow).
+                    dtype_backend: The dtype backend used for the "pandas" format (see to_df).
+                    prefetch: Whether to read the rows of the next batch into memory in the background (see
+                        InputColumn.advise).
+                    release: Whether to release the rows of each batch from memory once the next batch is requested,
+                        so that a scan does not fill memory with pages that will not be read again. Zero-copy arrays
+                        of released rows remain valid, but reading them reads the rows from storage again.
+
+                Returns:
+                     Iterator over the batches.
+            """
+            if batch_size <= 0:
+                raise ValueError("Invalid batch size specified: " + str(batch_size))
+
+            if format not in ("numpy", "pandas", "arrow"):
+                raise ValueError("Invalid batch format specified: " + str(format))
+
+            selected = self._columns if columns is None else [self._column_dict[name] for name in columns]
+            names = [column.name for column in selected]
+
+            for start in xrange(0, self._size, batch_size):
+                stop = min(start + batch_size, self._size)
+
+                if prefetch and stop < self._size:
+                    for column in selected:
+                        column.advise("willneed", stop, stop + batch_size)
+
+                if format == "numpy":
+                    yield {column.name: column._to_numpy(slice(start, stop)) for column in selected}
+                elif format == "pandas":
+                    import pandas as pd
+
+                    df = self.to_df(names, slice(start, stop), dtype_backend=dtype_backend)
+                    df.index = pd.RangeIndex(start, stop)
+                    yield df
+                else:
+                    import pyarrow as pa
+
+                    yield pa.RecordBatch.from_arrays([column._to_arrow(start, stop) for column in selected], names=names)
+
+                if release:
+                    for column in selected:
+                        column.advise("dontneed", start, stop)
+
+        def iter_xy(self, feature_columns, target_column=None, batch_size=65536, dtype="float64"):
+            """Iterate over the table in batches of training data for incremental learning, e.g.:
+
+                    for X, y in table.iter_xy(["x1", "x2"], "label"):
+                        model.partial_fit(X, y, classes=[0, 1])
+
+                Args:
+                    feature_columns: Names of the feature columns, which must have a numeric NumPy representation.
+                    target_column: Name of the target column, or None for no target.
+                    batch_size: The maximum number of rows per batch.
+                    dtype: The NumPy dtype of the feature matrix.
+
+                Returns:
+                     Iterator over (X, y) tuples, where X is a two-dimensional array of shape (rows, features) with
+                     nulls as NaN, and y is a one-dimensional array of target values (with nulls as NaN or None) or
+                     None if no target column is specified.
+            """
+            import numpy as np
+
+            if batch_size <= 0:
+                raise ValueError("Invalid batch size specified: " + str(batch_size))
+
+            features = [self._column_dict[name] for name in feature_columns]
+            target = None if target_column is None else self._column_dict[target_column]
+
+            for start in xrange(0, self._size, batch_size):
+                rows = slice(start, min(start + batch_size, self._size))
+                x = np.empty((rows.stop - start, len(features)), dtype)
+
+                for i, column in enumerate(features):
+                    values, mask = column._numpy_values(rows)
+
+                    if values is None:
+                        raise TypeError("Cannot use column " + column.name + " of type " + str(column.type) + " as feature")
+
+                    x[:, i] = values
+
+                    if mask is not None:
+                        x[mask, i] = np.nan
+
+                if target is None:
+                    yield x, None
+                else:
+                    yield x, target._to_pandas(rows, True, None)
+
+        def to_df(self, columns=None, rows=None, zero_copy=True, dtype_backend=None):
+            """Access table data as a Pandas data frame, built in a single constructor call from arrays converted
+                in bulk. Fixed-width numeric and TIMESTAMP columns (as int64 milliseconds) are wrapped directly over
+                the memory-mapped column data when zero_copy is set and the column has no nulls to fill in; DATE and
+                DATETIME columns become datetime64 and TIME timedelta64. DECIMAL columns become Decimal objects, so
+                that values are exact, except with the "pyarrow" backend, where they become decimal128(18, 4).
+
+                Args:
+                    columns: Names of the columns to include, in order; all columns by default.
+                    rows: Slice of the rows to include; all rows by default.
+                    zero_copy: Whether data frame columns may be read-only views of the column data; if False, all
+                        data is copied.
+                    dtype_backend: None for NumPy dtypes (nulls become NaN, NaT or None; integer columns with nulls
+                        become float64 only if all of their values are exact as float64, otherwise object),
+                        "numpy_nullable" for Pandas nullable dtypes for numeric and BOOLEAN nullable columns, or
+                        "pyarrow" for Arrow-backed dtypes for all columns.
+
+                Returns:
+                     Pandas Data Frame.
+            """
+            import pandas as pd
+
+            if dtype_backend not in (None, "numpy_nullable", "pyarrow"):
+                raise ValueError("Invalid dtype backend specified: " + str(dtype_backend))
+
+            if rows is None:
+                rows = slice(None)
+
+            selected = self._columns if columns is None else [self._column_dict[name] for name in columns]
+            data = {column.name: column._to_pandas(rows, zero_copy, dtype_backend) for column in selected}
+            return pd.DataFrame(data, columns=[column.name for column in selected], copy=not zero_copy)
+
 
     class OutputTable(Table):
         def __init__(self, file):
             super(ProcData.OutputTable, self).__init__(file, ProcData.OutputColumn)
+            self._auto_grow = False
 
         @property
         def size(self):
+            if self._auto_grow:
+                return max([self._size] + [column._pos for column in self._columns])
+
             return self._size
 
         @size.setter
@@ -816,10 +3276,181 @@ class ProcData(_SingletonType("_Singleton", (object,), {})):
 
             self._size = value
 
+        @property
+        def auto_grow(self):
+            """Whether the table grows automatically as rows are appended to its columns, so that its size need not
+                be set in advance. Column capacity grows geometrically, and the table is trimmed to the rows written
+                when output is complete; until then, columns may have more rows than have been written. In this mode,
+                size is the number of rows written, that is, the size last set or the number of rows appended to the
+                longest column, whichever is greater. Rows of a nullable column beyond those written to it are null
+                when output is complete; a non-nullable column with fewer rows than the table raises ValueError.
+            """
+            return self._auto_grow
+
+        @auto_grow.setter
+        def auto_grow(self, value):
+            self._auto_grow = bool(value)
+
+            for column in self._columns:
+                column._auto_grow = self._auto_grow
+
+        def append_batch(self, batch):
+            """Append a batch of rows to all columns of the table, keeping the columns in step: columns missing from
+                the batch are filled with nulls, and if writing the values of any column fails, all columns are reset
+                to the rows they had before the batch. Each column is written with OutputColumn.extend(), so arrays
+                are written in bulk.
+
+                Args:
+                    batch: Mapping (such as a dict or Pandas Data Frame) from column name to the values of that
+                        column, or sequence of the values of each column in table column order.
+
+                Returns:
+                     Index of the last row appended.
+            """
+            columns = self._columns
+
+            if hasattr(batch, "keys"):
+                names = set(batch.keys())
+                unknown = names.difference(self._column_dict)
+
+                if unknown:
+                    raise ValueError("Unknown column specified: " + str(sorted(unknown)[0]))
+
+                values = [batch[column.name] if column.name in names else None for column in columns]
+            else:
+                values = list(batch)
+
+                if len(values) != len(columns):
+                    raise ValueError("Incorrect number of columns in batch: " + str(len(values)))
+
+            for i, value in enumerate(values):
+                if hasattr(value, "isna"):
+                    import numpy as np
+
+                    # Pandas Series nulls are written as nulls, and Series without nulls are written in bulk
+                    mask = value.isna().to_numpy()
+                    value = value.to_numpy()
+                    values[i] = np.where(mask, None, value.astype(object)) if mask.any() else value
+                elif value is not None and not hasattr(value, "__len__"):
+                    values[i] = list(value)
+
+            lengths = set(len(value) for value in values if value is not None)
+
+            if len(lengths) > 1:
+                raise ValueError("Columns in batch have different lengths")
+
+            count = lengths.pop() if lengths else 0
+            index = columns[0]._pos if columns else 0
+
+            for column, value in _izip(columns, values):
+                if column._pos != index:
+                    raise RuntimeError("Columns of output table " + self._name + " are not in step")
+
+                if value is None and not column.is_nullable and count > 0:
+                    raise ValueError("Missing values for non-nullable column " + column.name)
+
+            for column in columns:
+                if index + count > column.size:
+                    column._grow(index + count)
+
+            var_positions = [column._var_data.pos if column._var_type else None for column in columns]
+
+            try:
+                for column, value in _izip(columns, values):
+                    column.extend([None] * count if value is None else value)
+            except Exception:
+                for column, var_position in _izip(columns, var_positions):
+                    column._pos = index
+
+                    if var_position is not None:
+                        column._var_data.seek(var_position)
+
+                raise
+
+            return index + count - 1
+
+        def append_rows(self, rows):
+            """Append rows given as sequences of column values in table column order, such as tuples, to all columns
+                of the table, keeping the columns in step; see append_batch().
+
+                Args:
+                    rows: Iterable of rows.
+
+                Returns:
+                     Index of the last row appended.
+            """
+            rows = list(rows)
+
+            if not rows:
+                return self.append_batch([[] for _ in self._columns])
+
+            return self.append_batch([list(values) for values in _izip(*rows)])
+
+        def from_arrow(self, data):
+            """Write an Apache Arrow RecordBatch or Table to the output table. The table size is set to the number
+                of rows in data, replacing anything previously written, and each Arrow column is written to the output
+                column of the same name. Fixed-width, string, binary and float list data, and validity bitmaps, are
+                copied in bulk without converting individual values to Python objects.
+
+                Args:
+                    data: The PyArrow RecordBatch or Table to write.
+            """
+            self.size = data.num_rows
+
+            for name, array in _izip(data.schema.names, data.columns):
+                self._column_dict[name]._from_arrow(array)
+
+        def from_df(self, df):
+            """Write a Pandas Data Frame to the output table. The table size is set to the number of rows in df,
+                replacing anything previously written, and each data frame column is written to the output column of
+                the same name. Numeric, boolean and datetime columns (including Pandas nullable and Arrow-backed
+                dtypes) are converted in bulk, as are string columns written to STRING, JSON or BYTES columns. Nulls
+                are taken from df.isna(); NaN values written to non-nullable DOUBLE and FLOAT columns are kept.
+
+                Args:
+                    df: The Pandas Data Frame to write.
+            """
+            self.size = len(df)
+
+            for name in df.columns:
+                self._column_dict[name]._from_series(df[name])
+
         def _complete(self):
+            if self._auto_grow:
+                size = self.size
+
+                for column in self._columns:
+                    column._pad(size, column._pos if column._var_type else max(column._pos, self._size))
+
+                self._size = size
+
             for column in self._columns:
                 column._complete()
 
+        def _redirect(self, path):
+            # Maps the table to new, empty, auto-growing files whose names start with path (see
+            # OutputColumn._redirect)
+            for index, column in enumerate(self._columns):
+                column._redirect(path + "." + str(index))
+
+            self._size = 0
+            self.auto_grow = True
+
+        def _merge(self, paths, counts):
+            # Appends the rows written by worker processes to files whose names start with each of paths (see
+            # _redirect), counts giving the number of rows each worker wrote, after the rows already written
+            index = max([0] + [column._pos for column in self._columns])
+            size = index + sum(counts)
+
+            if size > self.size:
+                self.size = size
+
+            for path, count in _izip(paths, counts):
+                for column_index, column in enumerate(self._columns):
+                    column._merge(path + "." + str(column_index), index, count)
+
+                index += count
+
 
     class DataSet(Sequence):
         def __init__(self, file, table_class):
@@ -853,7 +3484,36 @@ class ProcData(_SingletonType("_Singleton", (object,), {})):
                 table._complete()
 
 
+    @staticmethod
+    def warm_up(modules=("numpy", "pandas", "pyarrow")):
+        """Import optional libraries in a background thread, so that importing them overlaps with loading the proc
+            data rather than delaying the first call that needs them, e.g.:
+
+                ProcData.warm_up()
+                proc_data = ProcData()
+
+            Libraries that are not installed are skipped. Warm-up can also be requested without changing UDF code by
+            setting the KINETICA_PROC_WARM_UP environment variable to a comma-separated list of module names, in
+            which case it starts when this module is imported. ProcData.parallel_map() waits for warm-up to finish
+            before starting its worker processes.
+
+            Args:
+                modules: Names of the modules to import.
+
+            Returns:
+                 The thread importing the modules.
+        """
+        import threading
+
+        thread = threading.Thread(target=_warm_up, args=(list(modules),), name="kinetica_proc_warm_up")
+        thread.daemon = True
+        thread.start()
+        _warm_up_threads.append(thread)
+        return thread
+
     def __init__(self):
+        start = _timer()
+
         if "KINETICA_PCF" not in os.environ:
             raise RuntimeError("No control file specified")
 
@@ -883,6 +3543,8 @@ class ProcData(_SingletonType("_Singleton", (object,), {})):
         self._status = ""
         self._results = {}
         self._bin_results = {}
+        self._metrics = None
+        self._load_seconds = _timer() - start
 
     @property
     def request_info(self):
@@ -929,43 +3591,287 @@ class ProcData(_SingletonType("_Singleton", (object,), {})):
     def bin_results(self):
         return self._bin_results
 
-    def to_df(self):
-        """Access proc data as Pandas data frame. If the UDF input data is a single table then a Pandas Data Frame
-            is returned. If it is multiple tables then a Pandas Series where the elements are of type Data Frame
-            is returned.
+    def enable_metrics(self, results_key=None, path=None):
+        """Start recording metrics of where UDF time goes, available from the metrics property and exported as JSON
+            when complete() is called: the time taken to load the proc data, the rows and bytes decoded from each
+            input column and encoded into each output column and the time taken, totals by column type, the number of
+            times output files were grown, peak memory use, and page faults. Values decoded or encoded one at a time
+            take longer to process while metrics are recorded.
+
+            Args:
+                results_key: If specified, the metrics are added to results under this key on completion.
+                path: If specified, the metrics are written to a file at this path on completion.
+        """
+        if self._metrics is None:
+            import resource
+
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            self._metrics = {
+                "start": _timer(),
+                "growths": _MemoryMappedFile.growths,
+                "minor_page_faults": usage.ru_minflt,
+                "major_page_faults": usage.ru_majflt,
+                "complete_seconds": None,
+                "input": [(table, [(column, column._enable_metrics()) for column in table]) for table in self._input_data],
+                "output": [(table, [(column, column._enable_metrics()) for column in table]) for table in self._output_data]
+            }
+
+        self._metrics["results_key"] = results_key
+        self._metrics["path"] = path
+
+    @property
+    def metrics(self):
+        """Metrics recorded since enable_metrics() was called, as a dict (see enable_metrics), or None if metrics
+            are not enabled. Times are in seconds; other_seconds is the time not spent decoding or encoding, mostly
+            in UDF code.
+        """
+        if self._metrics is None:
+            return None
+
+        import resource
+
+        metrics = self._metrics
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        type_names = {value: name for name, value in vars(ProcData.ColumnType).items() if not name.startswith("_")}
+        types = {}
+        result = {
+            "load_seconds": self._load_seconds,
+            "elapsed_seconds": _timer() - metrics["start"],
+            "complete_seconds": metrics["complete_seconds"],
+            "decode_seconds": 0.0,
+            "encode_seconds": 0.0,
+            "file_growths": _MemoryMappedFile.growths - metrics["growths"],
+            "peak_rss_bytes": usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024),
+            "minor_page_faults": usage.ru_minflt - metrics["minor_page_faults"],
+            "major_page_faults": usage.ru_majflt - metrics["major_page_faults"],
+            "input": {},
+            "output": {},
+            "types": types
+        }
+
+        for direction in ("input", "output"):
+            for table, columns in metrics[direction]:
+                table_result = result[direction][table.name] = {}
+
+                for column, stats in columns:
+                    rows, size = (stats["rows"], stats["bytes"]) if direction == "input" else column._written_size()
+                    type_name = type_names.get(column.type, str(column.type))
+                    table_result[column.name] = {
+                        "type": type_name,
+                        "rows": rows,
+                        "bytes": size,
+                        "seconds": stats["seconds"],
+                        "calls": stats["calls"]
+                    }
+
+                    type_result = types.setdefault(type_name, {
+                        "rows_decoded": 0, "bytes_decoded": 0, "decode_seconds": 0.0,
+                        "rows_encoded": 0, "bytes_encoded": 0, "encode_seconds": 0.0
+                    })
+                    prefix = "decode" if direction == "input" else "encode"
+                    type_result["rows_" + prefix + "d"] += rows
+                    type_result["bytes_" + prefix + "d"] += size
+                    type_result[prefix + "_seconds"] += stats["seconds"]
+                    result[prefix + "_seconds"] += stats["seconds"]
+
+        result["other_seconds"] = result["elapsed_seconds"] - result["decode_seconds"] - result["encode_seconds"] - (metrics["complete_seconds"] or 0.0)
+        return result
+
+    def parallel_map(self, fn, n_workers=None, partition="rows"):
+        """Run a function in parallel across forked worker processes, each of which calls fn(proc_data, part) with
+            a disjoint part of the input data. Workers share the memory-mapped input data with this process, so it is
+            not copied. With partition="rows", part is a slice of rows: the rows of the largest input table split into
+            contiguous ranges, one per worker (slicing a column with it clips it to the size of its table). With
+            partition="columns", part is a list of the input columns (of all input tables) given to that worker.
+
+            Rows appended to output tables by a worker (the output tables of a worker are auto-growing and start
+            empty) are appended to the output tables of this process after any rows already written, in worker
+            order, so output is the same as if the parts had been processed in turn. Fixed-width data is copied,
+            and the var data of each worker appended and its positions offset in a second pass, once the lengths of
+            all output are known. Entries added to results and bin_results by workers are merged into those of this
+            process, in worker order. Workers must not call complete().
+
+            Args:
+                fn: The function to call in each worker, taking proc_data and part. Its return value must be
+                    picklable.
+                n_workers: The number of worker processes, by default the number of CPUs. No more workers are started
+                    than there are rows or columns to process.
+                partition: How input data is divided between workers: "rows" or "columns".
+
+            Returns:
+                 List of the return values of fn, in worker order.
+        """
+        import pickle
+        import shutil
+        import tempfile
+
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Parallel map requires os.fork")
+
+        if n_workers is None:
+            import multiprocessing
+            n_workers = multiprocessing.cpu_count()
+        elif n_workers < 1:
+            raise ValueError("Invalid number of workers specified: " + str(n_workers))
+
+        if partition == "rows":
+            total = max([0] + [table.size for table in self._input_data])
+            n_workers = max(1, min(n_workers, total))
+            parts = [slice(total * i // n_workers, total * (i + 1) // n_workers) for i in xrange(0, n_workers)]
+        elif partition == "columns":
+            columns = [column for table in self._input_data for column in table]
+            n_workers = max(1, min(n_workers, len(columns)))
+            parts = [columns[i::n_workers] for i in xrange(0, n_workers)]
+        else:
+            raise ValueError("Invalid partition specified: " + str(partition))
+
+        directory = tempfile.mkdtemp(prefix="kinetica_proc_")
+
+        try:
+            paths = [os.path.join(directory, str(i)) for i in xrange(0, n_workers)]
+            pids = []
+            sys.stdout.flush()
+            sys.stderr.flush()
+            _join_warm_up()
+
+            outcomes = []
+
+            try:
+                for path, part in _izip(paths, parts):
+                    pid = os.fork()
+
+                    if pid == 0:
+                        self._run_worker(fn, part, path)
+
+                    pids.append(pid)
+
+                for i, pid in enumerate(pids):
+                    status = os.waitpid(pid, 0)[1]
+                    pids[i] = None
+
+                    try:
+                        with open(paths[i] + ".result", "rb") as result_file:
+                            outcomes.append(pickle.load(result_file))
+                    except (IOError, OSError, EOFError):
+                        outcomes.append({"error": "exited with status " + str(status)})
+            except BaseException:
+                # If starting or waiting for workers fails (or is interrupted), workers still running are killed and
+                # reaped, so that none are left behind
+                import signal
+
+                for pid in pids:
+                    if pid is not None:
+                        try:
+                            os.kill(pid, signal.SIGKILL)
+                        except OSError:
+                            pass
+
+                        os.waitpid(pid, 0)
+
+                raise
+
+            for i, outcome in enumerate(outcomes):
+                if "error" in outcome:
+                    raise RuntimeError("Worker " + str(i) + " failed: " + outcome["error"])
+
+            for table_index, table in enumerate(self._output_data):
+                table._merge([path + "." + str(table_index) for path in paths], [outcome["sizes"][table_index] for outcome in outcomes])
+
+            for outcome in outcomes:
+                self._results.update(outcome["results"])
+                self._bin_results.update(outcome["bin_results"])
+
+            return [outcome["value"] for outcome in outcomes]
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def _run_worker(self, fn, part, path):
+        # Runs fn in a worker process forked by parallel_map, writing output to files whose names start with path and
+        # pickling the outcome to path + ".result"; never returns
+        import pickle
+        import traceback
+
+        status = 1
+
+        try:
+            try:
+                self._results = {}
+                self._bin_results = {}
+
+                for table_index, table in enumerate(self._output_data):
+                    table._redirect(path + "." + str(table_index))
+
+                value = fn(self, part)
+                self._output_data._complete()
+                outcome = {
+                    "value": value,
+                    "results": self._results,
+                    "bin_results": self._bin_results,
+                    "sizes": [table.size for table in self._output_data]
+                }
+                data = pickle.dumps(outcome, 2)
+                status = 0
+            except BaseException:
+                data = pickle.dumps({"error": traceback.format_exc()}, 2)
+
+            with open(path + ".result", "wb") as result_file:
+                result_file.write(data)
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(status)
+
+    def to_df(self, columns=None, rows=None, zero_copy=True, dtype_backend=None):
+        """Access proc data as Pandas data frame (see InputTable.to_df for the conversion of each column type). If
+            the UDF input data is a single table then a Pandas Data Frame is returned. If it is multiple tables then
+            a dict of Data Frames keyed by table name is returned.
+
+            Args:
+                columns: Names of the columns to include from each table; all columns by default.
+                rows: Slice of the rows to include from each table; all rows by default.
+                zero_copy: Whether data frame columns may be read-only views of the column data; if False, all data
+                    is copied.
+                dtype_backend: None for NumPy dtypes, "numpy_nullable" for Pandas nullable dtypes for nullable
+                    numeric and BOOLEAN columns, or "pyarrow" for Arrow-backed dtypes.
 
             Returns:
-                 Pandas Data Frame if single table, Pandas Series of Data Frames if multiple tables.
+                 Pandas Data Frame if single table, dict of Data Frames if multiple tables.
         """
-        import pandas as pd
-
-        table_data = pd.Series()
-        for in_table in self.input_data:
-            current_table_data = pd.DataFrame()
-            for in_column in in_table:
-                # Need to use the slice to be able to use a slice on the column
-                # later
-                current_table_data[in_column.name] = in_column[:]
-            # end inner loop
-
-            table_data[in_table.name] = current_table_data
+        table_data = {in_table.name: in_table.to_df(columns, rows, zero_copy, dtype_backend) for in_table in self.input_data}
+
         if len(table_data) == 1:
-            return table_data[0]
+            return next(iter(table_data.values()))
+
         return table_data
 
 
     def from_df(self, df, output_table):
-        """Assign data in a Pandas Data Frame to an output table in Kinetica.
-            To use this, make sure df has the same schema as output table: number of columns and column names
-            have to match.
+        """Assign data in a Pandas Data Frame to an output table in Kinetica (see OutputTable.from_df).
+            The output table size is set to the number of rows in df, and each column of df is written to the
+            output table column of the same name.
 
             Args:
                 df: The Pandas Data Frame which will be written into output_table.
                 output_table: The output table in Kinetica (the actual table object, not just the name) that will
                 receive the content of df.
         """
-        for col in df.columns:
-            output_table[col][:] = df[col]
+        output_table.from_df(df)
+
+
+    def to_arrow(self):
+        """Access proc data as Apache Arrow record batches (see InputTable.to_arrow). If the UDF input data is a
+            single table then a RecordBatch is returned. If it is multiple tables then a dict of RecordBatches keyed
+            by table name is returned.
+
+            Returns:
+                 PyArrow RecordBatch if single table, dict of PyArrow RecordBatches if multiple tables.
+        """
+        table_data = {in_table.name: in_table.to_arrow() for in_table in self.input_data}
+
+        if len(table_data) == 1:
+            return next(iter(table_data.values()))
+
+        return table_data
 
 
     def to_cudf(self):
@@ -1002,19 +3908,22 @@ class ProcData(_SingletonType("_Singleton", (object,), {})):
                  Pygdf Data Frame if single table, Pandas Series of Pygdf Data Frames if multiple tables.
                  None if Pygdf is not installed.
         """
-        try:
-            table_data = self.to_df()
-            if isinstance(table_data, pd.DataFrame):
-                return pygdf.dataframe.DataFrame.from_pandas(table_data)
-            gpu_df_series = pd.Series()
-            for table_name in table_data.index:
-                current_gpu_df = pygdf.dataframe.DataFrame.from_pandas(table_data[table_name])
-                gpu_df_series[table_name] = current_gpu_df
-            return gpu_df_series
-        except NameError:
+        pd = _backend("pandas")
+        gdf = _backend("cudf") or _backend("pygdf")
+
+        if pd is None or gdf is None:
             print('Pygdf not installed.')
             return None
 
+        table_data = self.to_df()
+        if isinstance(table_data, pd.DataFrame):
+            return gdf.DataFrame.from_pandas(table_data)
+        gpu_df_series = pd.Series(dtype=object)
+        for table_name in table_data:
+            current_gpu_df = gdf.DataFrame.from_pandas(table_data[table_name])
+            gpu_df_series[table_name] = current_gpu_df
+        return gpu_df_series
+
     def from_gdf(self, gdf, output_table):
         """Assign data in a Pygdf Data Frame to an output table in Kinetica.
             To use this, make sure the gdf has the same schema as output table: number of columns and column names
@@ -1042,19 +3951,22 @@ class ProcData(_SingletonType("_Singleton", (object,), {})):
                  H2O Data Frame if single table, Pandas Series of H2O Data Frames if multiple tables.
                  None if H2o is not installed.
         """
-        try:
-            table_data = self.to_df()
-            if isinstance(table_data, pd.DataFrame):
-                return h2o.H2OFrame(table_data)
-            h2o_df_series = pd.Series()
-            for table_name in table_data.index:
-                current_h2o_df = h2o.H2OFrame(table_data[table_name])
-                h2o_df_series[table_name] = current_h2o_df
-            return h2o_df_series
-        except NameError:
+        pd = _backend("pandas")
+        h2o = _backend("h2o")
+
+        if pd is None or h2o is None:
             print('H2O not installed.')
             return None
 
+        table_data = self.to_df()
+        if isinstance(table_data, pd.DataFrame):
+            return h2o.H2OFrame(table_data)
+        h2o_df_series = pd.Series(dtype=object)
+        for table_name in table_data:
+            current_h2o_df = h2o.H2OFrame(table_data[table_name])
+            h2o_df_series[table_name] = current_h2o_df
+        return h2o_df_series
+
     def from_h2odf(self, h2odf, output_table):
         """Assign data in a H2O Data Frame to an output table in Kinetica.
             To use this, make sure the gdf has the same schema as output table: number of columns and column names
@@ -1068,9 +3980,92 @@ class ProcData(_SingletonType("_Singleton", (object,), {})):
         self.from_df(df=h2odf.as_data_frame(), output_table=output_table)
 
     def complete(self):
+        start = _timer()
         self._output_data._complete()
+        metrics = None
+
+        if self._metrics is not None:
+            self._metrics["complete_seconds"] = _timer() - start
+            metrics = self.metrics
+
+            if self._metrics["results_key"] is not None:
+                self._results[self._metrics["results_key"]] = json.dumps(metrics)
+
         control_file = _MemoryMappedFile()
         control_file.map(self._output_control_file_name, True)
         control_file.write_uint64(1)
         control_file.write_dict(self._results)
         control_file.write_dict(self._bin_results)
+        control_file.truncate()
+
+        if metrics is not None and self._metrics["path"] is not None:
+            with open(self._metrics["path"], "w") as metrics_file:
+                json.dump(metrics, metrics_file, indent=2, sort_keys=True)
+
+
+# Codecs of all Kinetica types, keyed by ProcData.ColumnType
+_codecs = {
+    ProcData.ColumnType.ARRAY: _Codec(
+        8,
+        lambda var_data, start, end: None if end - start <= 1 else json.loads(_decode_string(var_data[start : end - 1])),
+        None,
+        lambda var_data, value: var_data.write(_encode_string(json.dumps(value)), True),
+        None
+    ),
+    ProcData.ColumnType.BOOLEAN: _fixed_codec(1, "?"),
+    ProcData.ColumnType.BYTES: _Codec(
+        8,
+        lambda var_data, start, end: b"" if start == end else var_data[start : end],
+        None,
+        lambda var_data, value: var_data.write(value, False),
+        None
+    ),
+    ProcData.ColumnType.CHAR1: _char_codec(1),
+    ProcData.ColumnType.CHAR2: _char_codec(2),
+    ProcData.ColumnType.CHAR4: _char_codec(4),
+    ProcData.ColumnType.CHAR8: _char_codec(8),
+    ProcData.ColumnType.CHAR16: _char_codec(16),
+    ProcData.ColumnType.CHAR32: _char_codec(32),
+    ProcData.ColumnType.CHAR64: _char_codec(64),
+    ProcData.ColumnType.CHAR128: _char_codec(128),
+    ProcData.ColumnType.CHAR256: _char_codec(256),
+    ProcData.ColumnType.DATE: _fixed_codec(4, "i", _decode_date, _encode_date),
+    ProcData.ColumnType.DATETIME: _fixed_codec(8, "q", _decode_datetime, _encode_datetime),
+    ProcData.ColumnType.DECIMAL: _fixed_codec(8, "q", lambda value: decimal.Decimal(value).scaleb(-4), lambda value: long(value * 10000)),
+    ProcData.ColumnType.DOUBLE: _fixed_codec(8, "d"),
+    ProcData.ColumnType.FLOAT: _fixed_codec(4, "f"),
+    ProcData.ColumnType.INT: _fixed_codec(4, "i", None, int),
+    ProcData.ColumnType.INT8: _fixed_codec(1, "b", None, int),
+    ProcData.ColumnType.INT16: _fixed_codec(2, "h", None, int),
+    ProcData.ColumnType.IPV4: _fixed_codec(4, "i", None, int),
+    ProcData.ColumnType.JSON: _Codec(
+        8,
+        lambda var_data, start, end: "" if end - start <= 1 else _decode_string(var_data[start : end - 1]),
+        None,
+        lambda var_data, value: var_data.write(_encode_string(value), True),
+        None
+    ),
+    ProcData.ColumnType.LONG: _fixed_codec(8, "q", None, long),
+    ProcData.ColumnType.STRING: _Codec(
+        8,
+        lambda var_data, start, end: "" if end - start <= 1 else _decode_string(var_data[start : end - 1]),
+        None,
+        lambda var_data, value: var_data.write(_encode_string(value), True),
+        None
+    ),
+    ProcData.ColumnType.TIME: _fixed_codec(4, "I", _decode_time, _encode_time),
+    ProcData.ColumnType.TIMESTAMP: _fixed_codec(8, "q", None, long),
+    ProcData.ColumnType.ULONG: _fixed_codec(8, "Q", None, long),
+    ProcData.ColumnType.UUID: _uuid_codec(),
+    ProcData.ColumnType.VECTOR: _Codec(
+        8,
+        lambda var_data, start, end: None if start == end else list(_struct("f", (end - start) // 4).unpack_from(var_data, start)),
+        None,
+        lambda var_data, value: var_data.write(_struct("f", len(value)).pack(*value), False),
+        None
+    )
+}
+
+
+if os.environ.get("KINETICA_PROC_WARM_UP"):
+    ProcData.warm_up([name.strip() for name in os.environ["KINETICA_PROC_WARM_UP"].split(",") if name.strip()])
@@ -0,0 +1,135 @@
+# ---------------------------------------------------------------------------
+# File     : conftest.py
+# Purpose  : Fixtures for tests of the Kinetica Python UDF API, writing proc
+#            control and column files as the database does for a UDF.
+# Copyright: Kinetica (2021)
+# ---------------------------------------------------------------------------
+
+import json
+import os
+import struct
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import kinetica_proc
+from kinetica_proc import ProcData
+
+CT = ProcData.ColumnType
+
+_VAR_TYPES = (CT.ARRAY, CT.BYTES, CT.JSON, CT.STRING, CT.VECTOR)
+
+
+def _write_string(f, value):
+    value = value.encode()
+    f.write(struct.pack("=Q", len(value)))
+    f.write(value)
+
+
+def _write_dict(f, value):
+    f.write(struct.pack("=Q", len(value)))
+
+    for k, v in value.items():
+        _write_string(f, k)
+        _write_string(f, v)
+
+
+def _encode_var(column_type, value):
+    if column_type == CT.BYTES:
+        return value
+    elif column_type == CT.VECTOR:
+        return struct.pack("=" + str(len(value)) + "f", *value)
+    elif column_type == CT.ARRAY:
+        return json.dumps(value).encode() + b"\x00"
+    else:
+        return value.encode() + b"\x00"
+
+
+def _write_column(f, directory, name, column_type, values, nullable, encode):
+    # Writes the column descriptor and, for input columns, the column files; values are encoded with encode for
+    # fixed-width types (values of null rows are left as zero)
+    _write_string(f, name)
+    f.write(struct.pack("=Q", column_type))
+    var = column_type in _VAR_TYPES
+    paths = [os.path.join(directory, name + suffix) for suffix in (".data", ".nulls", ".var")]
+    data = []
+    nulls = []
+    var_data = []
+    var_pos = 0
+
+    for value in values:
+        nulls.append(b"\x01" if value is None else b"\x00")
+
+        if var:
+            data.append(struct.pack("=Q", var_pos))
+
+            if value is not None:
+                encoded = _encode_var(column_type, value)
+                var_data.append(encoded)
+                var_pos += len(encoded)
+        else:
+            data.append(encode(column_type, value))
+
+    for path, content, used in zip(paths, (data, nulls, var_data), (True, nullable, var)):
+        if used:
+            with open(path, "wb") as column_file:
+                column_file.write(b"".join(content))
+
+    _write_string(f, paths[0])
+    _write_string(f, paths[1] if nullable else "")
+    _write_string(f, paths[2] if var else "")
+
+
+@pytest.fixture
+def make_proc_data(tmp_path, monkeypatch):
+    """Return a function building a ProcData from input tables given as (name, [(column name, type, values,
+        nullable)]) and output tables given as (name, [(column name, type, nullable)]). Fixed-width input values
+        are given already encoded as bytes, or as int or float values packed with the format of the column type.
+    """
+    formats = {CT.BOOLEAN: "=?", CT.DOUBLE: "=d", CT.FLOAT: "=f", CT.INT: "=i", CT.INT8: "=b", CT.INT16: "=h",
+               CT.IPV4: "=i", CT.LONG: "=q", CT.TIMESTAMP: "=q", CT.ULONG: "=Q", CT.DATE: "=i", CT.DATETIME: "=q",
+               CT.TIME: "=I", CT.DECIMAL: "=q"}
+
+    def encode(column_type, value):
+        if value is None:
+            return b"\x00" * kinetica_proc._codecs[column_type].size
+        elif isinstance(value, bytes):
+            return value
+        else:
+            return struct.pack(formats[column_type], value)
+
+    def make(inputs=(), outputs=()):
+        kinetica_proc._SingletonType._instances.clear()
+        control_path = str(tmp_path / "control")
+
+        with open(control_path, "wb") as f:
+            f.write(struct.pack("=Q", 1))
+            _write_dict(f, {"rank_number": "1", "tom_number": "0"})
+            _write_dict(f, {})
+            _write_dict(f, {})
+            _write_dict(f, {})
+
+            for tables, output in ((inputs, False), (outputs, True)):
+                f.write(struct.pack("=Q", len(tables)))
+
+                for table_name, columns in tables:
+                    directory = str(tmp_path / (("out_" if output else "in_") + table_name))
+                    os.mkdir(directory)
+                    _write_string(f, table_name)
+                    f.write(struct.pack("=Q", len(columns)))
+
+                    for column in columns:
+                        if output:
+                            _write_column(f, directory, column[0], column[1], [], column[2], encode)
+                        else:
+                            _write_column(f, directory, column[0], column[1], column[2], column[3], encode)
+
+            _write_string(f, str(tmp_path / "output_control"))
+
+        monkeypatch.setenv("KINETICA_PCF", control_path)
+        return ProcData()
+
+    yield make
+    kinetica_proc._SingletonType._instances.clear()
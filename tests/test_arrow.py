@@ -0,0 +1,81 @@
+import decimal
+import uuid
+
+import pytest
+
+from conftest import CT
+
+np = pytest.importorskip("numpy")
+pa = pytest.importorskip("pyarrow")
+
+_uuid = uuid.UUID("12345678-1234-5678-1234-567812345678")
+
+_columns = [("i", CT.INT, [1, None, 3], True), ("d", CT.DOUBLE, [0.5, 1.5, -2.0], False),
+            ("t", CT.TIMESTAMP, [0, 1000, None], True), ("s", CT.STRING, ["a", None, "ccc"], True),
+            ("b", CT.BYTES, [b"\x00\x01", b"", b"z"], False), ("v", CT.VECTOR, [[1.0, 2.0], [3.0], []], False),
+            ("m", CT.DECIMAL, [12345, -1, None], True), ("u", CT.UUID, [_uuid.bytes[::-1], None, None], True)]
+
+
+@pytest.fixture
+def proc_data(make_proc_data):
+    return make_proc_data([("in", _columns)], [("out", [(name, column_type, nullable)
+                                                        for name, column_type, _, nullable in _columns])])
+
+
+def _address(column):
+    return np.frombuffer(column._data.data, np.uint8).ctypes.data
+
+
+def test_to_arrow(proc_data):
+    batch = proc_data.input_data[0].to_arrow()
+
+    assert batch.num_rows == 3
+    assert batch.column(0).to_pylist() == [1, None, 3]
+    assert batch.column(2).type == pa.timestamp("ms")
+    assert batch.column(2).to_pylist()[2] is None
+    assert batch.column(3).type == pa.large_string()
+    assert batch.column(3).to_pylist() == ["a", None, "ccc"]
+    assert batch.column(4).to_pylist() == [b"\x00\x01", b"", b"z"]
+    assert batch.column(5).to_pylist() == [[1.0, 2.0], [3.0], []]
+    assert batch.column(6).type == pa.decimal128(18, 4)
+    assert batch.column(6).to_pylist() == [decimal.Decimal("1.2345"), decimal.Decimal("-0.0001"), None]
+    assert batch.column(7).to_pylist() == [_uuid.bytes, None, None]
+
+
+def test_to_arrow_is_zero_copy(proc_data):
+    table = proc_data.input_data[0]
+
+    for name in ("i", "d", "t"):
+        assert table[name].to_arrow().buffers()[1].address == _address(table[name])
+
+    var_data = table["b"]._var_data.data
+    assert table["b"].to_arrow().buffers()[2].address == np.frombuffer(var_data, np.uint8).ctypes.data
+
+
+def test_from_arrow_round_trip(proc_data):
+    source = proc_data.input_data[0]
+    output = proc_data.output_data[0]
+    output.from_arrow(source.to_arrow())
+    proc_data.complete()
+
+    assert output.size == 3
+
+    for column in source:
+        assert output[column.name][:] == column[:]
+
+
+def test_from_arrow_table_chunks_and_nulls(make_proc_data):
+    proc_data = make_proc_data(outputs=[("out", [("i", CT.LONG, True), ("s", CT.STRING, False),
+                                                 ("n", CT.INT, False)])])
+    output = proc_data.output_data[0]
+    data = pa.Table.from_batches([pa.record_batch([pa.array([1, None]), pa.array(["x", "yy"])], names=["i", "s"]),
+                                  pa.record_batch([pa.array([3]), pa.array(["z"])], names=["i", "s"])])
+
+    with pytest.raises(ValueError):
+        output.from_arrow(pa.table({"n": pa.array([1, None], pa.int32())}))
+
+    output.from_arrow(data)
+    proc_data.complete()
+
+    assert output["i"][:] == [1, None, 3]
+    assert output["s"][:] == ["x", "yy", "z"]
@@ -0,0 +1,87 @@
+import struct
+
+import pytest
+
+from conftest import CT
+
+
+@pytest.fixture
+def output(make_proc_data):
+    proc_data = make_proc_data(outputs=[("out", [("a", CT.INT, False), ("b", CT.INT, True), ("s", CT.STRING, True),
+                                                 ("t", CT.STRING, False)])])
+    table = proc_data.output_data[0]
+    table.auto_grow = True
+    return proc_data, table
+
+
+def test_uneven_nullable_columns_padded_with_nulls(output):
+    proc_data, table = output
+    table["a"].extend([1, 2, 3])
+    table["b"].append(7)
+    table["s"].append("x")
+    table["t"].extend(["p", "q", "r"])
+    proc_data.complete()
+
+    assert table.size == 3
+    assert table["a"][:] == [1, 2, 3]
+    assert table["b"][:] == [7, None, None]
+    assert table["s"][:] == ["x", None, None]
+    assert table["t"][:] == ["p", "q", "r"]
+
+
+def test_uneven_non_nullable_column_raises(output):
+    proc_data, table = output
+    table["a"].extend([1, 2, 3])
+    table["t"].append("p")
+
+    with pytest.raises(ValueError):
+        proc_data.complete()
+
+
+def test_set_size_counts_as_written(output):
+    proc_data, table = output
+    table.size = 2
+    table["a"][:] = [4, 5]
+    table["t"].extend(["p", "q"])
+    proc_data.complete()
+
+    assert table["a"][:] == [4, 5]
+    assert table["s"][:] == [None, None]
+
+
+def test_parallel_map_pads_uneven_columns(make_proc_data):
+    proc_data = make_proc_data([("in", [("x", CT.INT, [1, 2, 3, 4], False)])],
+                               [("out", [("a", CT.INT, False), ("s", CT.STRING, True)])])
+    table = proc_data.output_data[0]
+
+    def fn(proc_data, rows):
+        for value in proc_data.input_data[0]["x"][rows]:
+            table["a"].append(value)
+
+            if value % 2:
+                table["s"].append(str(value))
+
+    proc_data.parallel_map(fn, 2)
+    proc_data.complete()
+
+    assert table["a"][:] == [1, 2, 3, 4]
+    assert table["s"][:] == ["1", None, "3", None]
+
+
+def test_append_batch_failure_keeps_columns_in_step(output):
+    proc_data, table = output
+    table.append_batch({"a": [1], "b": [2], "s": ["x"], "t": ["y"]})
+
+    with pytest.raises(struct.error):
+        table.append_batch({"a": [3, 4], "b": [5, 2 ** 40], "s": ["p", "q"], "t": ["r", "s"]})
+
+    assert [column._pos for column in table] == [1, 1, 1, 1]
+
+    table.append_rows([(6, None, "z", "w")])
+    proc_data.complete()
+
+    assert table.size == 2
+    assert table["a"][:] == [1, 6]
+    assert table["b"][:] == [2, None]
+    assert table["s"][:] == ["x", "z"]
+    assert table["t"][:] == ["y", "w"]
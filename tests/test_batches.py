@@ -0,0 +1,48 @@
+import decimal
+
+import pytest
+
+from conftest import CT
+
+np = pytest.importorskip("numpy")
+
+_columns = [("i", CT.INT, [1, None, 3, 4, 5], True), ("m", CT.DECIMAL, [12345, None, 1, 2, 123456789012345678], True),
+            ("s", CT.STRING, ["a", "b", None, "d", "e"], True)]
+
+
+@pytest.fixture
+def table(make_proc_data):
+    return make_proc_data([("in", _columns)]).input_data[0]
+
+
+def test_numpy_batches(table):
+    batches = list(table.iter_batches(2))
+
+    assert [len(batch["i"]) for batch in batches] == [2, 2, 1]
+    assert batches[0]["i"].tolist() == [1, None]
+    assert batches[1]["s"].tolist() == [None, "d"]
+    assert batches[0]["m"].tolist() == [decimal.Decimal("1.2345"), None]
+    assert batches[2]["m"].tolist() == [decimal.Decimal("12345678901234.5678")]
+
+
+def test_pandas_batches_concatenate_to_df(table):
+    pd = pytest.importorskip("pandas")
+    batches = list(table.iter_batches(2, format="pandas"))
+
+    assert batches[1].index.tolist() == [2, 3]
+    pd.testing.assert_frame_equal(pd.concat(batches), table.to_df())
+
+
+def test_arrow_batches(table):
+    pa = pytest.importorskip("pyarrow")
+    batches = list(table.iter_batches(3, columns=["s"], format="arrow", prefetch=False, release=True))
+
+    assert pa.Table.from_batches(batches).column("s").to_pylist() == ["a", "b", None, "d", "e"]
+
+
+def test_invalid_arguments(table):
+    with pytest.raises(ValueError):
+        next(table.iter_batches(0))
+
+    with pytest.raises(ValueError):
+        next(table.iter_batches(format="csv"))
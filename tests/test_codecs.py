@@ -0,0 +1,94 @@
+import ipaddress
+import struct
+import uuid
+
+import pytest
+
+import kinetica_proc
+
+from conftest import CT
+
+np = pytest.importorskip("numpy")
+
+
+def test_char_arrays(make_proc_data):
+    values = ["ab", "", "wxyz", "é"]
+    proc_data = make_proc_data([("in", [("c", CT.CHAR4, [kinetica_proc._encode_char(value, 4) for value in values],
+                                         False), ("i", CT.INT, [1, 2, 3, 4], False)])])
+    column = proc_data.input_data[0]["c"]
+
+    assert column.as_chars().tolist() == [value.encode() for value in values]
+    assert column.as_chars(decode=True).tolist() == values
+    assert column.as_chars(decode=True).dtype == "U4"
+    assert column[:] == values
+
+    with pytest.raises(TypeError):
+        proc_data.input_data[0]["i"].as_chars()
+
+
+def test_char_array_writes(make_proc_data):
+    proc_data = make_proc_data(outputs=[("out", [("c", CT.CHAR4, True), ("i", CT.INT, False)])])
+    output = proc_data.output_data[0]
+    output.size = 3
+    column = output["c"]
+
+    column[:] = np.array(["ab", "toolong", "é"])
+    assert column[:] == ["ab", "tool", "é"]
+
+    column[:] = np.ma.masked_array(np.array([b"x", b"", b"yz"]), [False, True, False])
+    assert column[:] == ["x", None, "yz"]
+
+    assert column.char_overflow(np.array(["abcd", "abcde", "éé", "ééé"])).tolist() == [False, True, False, True]
+
+    with pytest.raises(TypeError):
+        column.char_overflow(np.array([1, 2]))
+
+    with pytest.raises(TypeError):
+        output["i"].char_overflow(np.array(["a"]))
+
+
+def test_uuid_arrays(make_proc_data):
+    values = [uuid.uuid4() for _ in range(3)]
+    proc_data = make_proc_data([("in", [("u", CT.UUID, [value.bytes[::-1] for value in values], False)])],
+                               [("out", [("u", CT.UUID, True)])])
+    column = proc_data.input_data[0]["u"]
+
+    assert column.as_uuid().tolist() == [value.bytes for value in values]
+    raw = column.as_uuid(raw=True)
+    assert [(int(high) << 64) | int(low) for low, high in raw.tolist()] == [value.int for value in values]
+    assert not raw.flags.writeable
+
+    output = proc_data.output_data[0]
+    output.size = 3
+    output["u"][:] = column.as_uuid()
+    assert output["u"][:] == values
+
+    output["u"][:] = np.ma.masked_array(raw, [False, True, False])
+    assert output["u"][:] == [values[0], None, values[2]]
+
+    with pytest.raises(ValueError):
+        output["u"][:] = np.array([b"short", b"", b""], "S8")
+
+
+def test_ipv4_arrays(make_proc_data):
+    addresses = ["10.1.2.3", "192.168.0.1", "255.255.255.255", None]
+    proc_data = make_proc_data([("in", [("a", CT.IPV4, [None if address is None else
+                                                        struct.pack("=I", int(ipaddress.IPv4Address(address)))
+                                                        for address in addresses], True)])],
+                               [("out", [("a", CT.IPV4, False)])])
+    column = proc_data.input_data[0]["a"]
+
+    assert column.as_ipv4()[:3].tolist() == [int(ipaddress.IPv4Address(address)) for address in addresses[:3]]
+    assert column.ipv4_lookup(["10.0.0.0/8", "192.168.0.0/16", "192.168.0.0/24"]).tolist() == [0, 2, -1, -1]
+    assert column.ipv4_in(["255.0.0.0/8", "10.1.2.3/32"]).tolist() == [True, False, True, False]
+
+    output = proc_data.output_data[0]
+    output.size = 2
+    output["a"][:] = np.array([2 ** 32 - 1, -1], np.int64)
+    assert np.frombuffer(output["a"]._data.data, "=u4", 2).tolist() == [2 ** 32 - 1, 2 ** 32 - 1]
+
+    with pytest.raises(struct.error):
+        output["a"][:] = np.array([2 ** 40 + 5, -1], np.int64)
+
+    with pytest.raises(struct.error):
+        output["a"][:] = np.array([-2 ** 31 - 1, 0], np.int64)
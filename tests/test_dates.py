@@ -0,0 +1,49 @@
+import datetime
+
+import pytest
+
+import kinetica_proc
+
+from conftest import CT
+
+
+def test_nullable_date_slices(make_proc_data):
+    date = datetime.date(2024, 5, 15)
+    moment = datetime.datetime(2024, 5, 15, 12, 30, 45, 123000)
+    proc_data = make_proc_data([("in", [("d", CT.DATE, [kinetica_proc._encode_date(date), None, None,
+                                                        kinetica_proc._encode_date(date)], True),
+                                        ("t", CT.DATETIME, [None, kinetica_proc._encode_datetime(moment), None,
+                                                            None], True)])])
+    table = proc_data.input_data[0]
+
+    assert table["d"][:] == [date, None, None, date]
+    assert table["d"][1:4] == [None, None, date]
+    assert table["t"][:] == [None, moment, None, None]
+    assert table["d"][1] is None
+
+
+def test_datetime64_round_trip_with_nat(make_proc_data):
+    np = pytest.importorskip("numpy")
+    proc_data = make_proc_data(outputs=[("out", [("d", CT.DATE, True), ("dt", CT.DATETIME, True),
+                                                 ("t", CT.TIME, True)])])
+    table = proc_data.output_data[0]
+    table.size = 3
+    table["d"][:] = np.array(["2024-05-15", "NaT", "1999-12-31"], "M8[D]")
+    table["dt"][:] = np.array(["NaT", "2024-05-15T12:30:45.123", "1970-01-01"], "M8[ms]")
+    table["t"][:] = np.array([0, 45296789, "NaT"], "m8[ms]")
+
+    assert table["d"][:] == [datetime.date(2024, 5, 15), None, datetime.date(1999, 12, 31)]
+    assert table["dt"][:] == [None, datetime.datetime(2024, 5, 15, 12, 30, 45, 123000), datetime.datetime(1970, 1, 1)]
+    assert table["t"][:] == [datetime.time(0, 0), datetime.time(12, 34, 56, 789000), None]
+    assert np.frombuffer(table["dt"]._data.data, "=i8", 3)[0] == 0
+    assert np.frombuffer(table["d"]._data.data, "=i4", 3)[1] == 0
+
+
+def test_from_df_with_nat(make_proc_data):
+    pd = pytest.importorskip("pandas")
+    proc_data = make_proc_data(outputs=[("out", [("dt", CT.DATETIME, True)])])
+    table = proc_data.output_data[0]
+    proc_data.from_df(pd.DataFrame({"dt": pd.to_datetime(["2024-05-15 01:02:03", None])}), table)
+
+    assert table["dt"][:] == [datetime.datetime(2024, 5, 15, 1, 2, 3), None]
+    assert table["dt"][1] is None
@@ -0,0 +1,75 @@
+import decimal
+import struct
+
+import pytest
+
+from kinetica_proc import ProcData
+
+from conftest import CT
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def output(make_proc_data):
+    proc_data = make_proc_data(outputs=[("out", [("d", CT.DECIMAL, True)])])
+    table = proc_data.output_data[0]
+    table.size = 2
+    return table
+
+
+def test_decimal_arrays_written_exactly(output):
+    output["d"][:] = np.array([1.23456, np.nan])
+    assert output["d"][:] == [decimal.Decimal("1.2346"), None]
+
+    output["d"][:] = np.array([-922337203685477, 5], np.int64)
+    assert output["d"][:] == [decimal.Decimal("-922337203685477.0000"), decimal.Decimal("5.0000")]
+
+    output["d"][:] = ProcData.DecimalArray(np.array([12345, -5], np.int64), 2)
+    assert output["d"][:] == [decimal.Decimal("123.45"), decimal.Decimal("-0.05")]
+
+
+def test_decimal_array_overflow_rejected(output):
+    with pytest.raises(struct.error):
+        output["d"][:] = np.array([1e20, 1.0])
+
+    with pytest.raises(struct.error):
+        output["d"][:] = np.array([2 ** 62, 1], np.int64)
+
+    with pytest.raises(struct.error):
+        output["d"][:] = np.array([2 ** 63, 1], np.uint64)
+
+    with pytest.raises(ValueError):
+        output["d"][:] = np.array([np.inf, 1.0])
+
+    with pytest.raises(OverflowError):
+        output["d"][:] = ProcData.DecimalArray(np.array([2 ** 60, 1], np.int64), 0)
+
+    with pytest.raises(struct.error):
+        output["d"].append(decimal.Decimal(2 ** 62))
+
+
+def test_rescale():
+    values = ProcData.DecimalArray(np.array([125, 135, -125], np.int64), 2)
+
+    assert values.rescale(1).values.tolist() == [12, 14, -12]
+    assert values.rescale(4).values.tolist() == [12500, 13500, -12500]
+    assert ProcData.DecimalArray(np.zeros(2, np.int64), 0).rescale(30).values.tolist() == [0, 0]
+
+    with pytest.raises(OverflowError):
+        values.rescale(19)
+
+
+def test_from_arrow_decimal128(make_proc_data):
+    pa = pytest.importorskip("pyarrow")
+    proc_data = make_proc_data(outputs=[("out", [("d", CT.DECIMAL, True)])])
+    table = proc_data.output_data[0]
+    table.from_arrow(pa.table({"d": pa.array([decimal.Decimal("-1.5"), None], pa.decimal128(10, 2))}))
+
+    assert table["d"][:] == [decimal.Decimal("-1.5000"), None]
+
+    proc_data = make_proc_data(outputs=[("big", [("d", CT.DECIMAL, True)])])
+    table = proc_data.output_data[0]
+
+    with pytest.raises(struct.error):
+        table.from_arrow(pa.table({"d": pa.array([decimal.Decimal(2 ** 70), None], pa.decimal128(38, 0))}))
@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+import kinetica_proc
+
+from conftest import CT
+
+
+def test_writes_grow_geometrically(tmp_path):
+    path = str(tmp_path / "file")
+    f = kinetica_proc._MemoryMappedFile()
+    f.map(path, True)
+    growths = kinetica_proc._MemoryMappedFile.growths
+
+    for _ in range(10000):
+        f.write(b"0123456789")
+
+    assert kinetica_proc._MemoryMappedFile.growths - growths < 20
+    assert f.size >= f.pos == 100000
+
+    f.truncate()
+    f.unmap()
+    assert os.path.getsize(path) == 100000
+
+    with open(path, "rb") as data:
+        assert data.read(20) == b"01234567890123456789"
+
+
+def test_remap_keeps_data(tmp_path):
+    f = kinetica_proc._MemoryMappedFile()
+    f.map(str(tmp_path / "file"), True, 16)
+    f.data[0:4] = b"abcd"
+    f.remap(1 << 20)
+    f.data[(1 << 20) - 1] = 1
+    f.remap(8)
+
+    assert f.size == 8
+    assert f.data[0:4] == b"abcd"
+    f.unmap()
+
+
+def test_reserve_bytes(make_proc_data):
+    proc_data = make_proc_data(outputs=[("out", [("s", CT.STRING, False), ("i", CT.INT, False)])])
+    output = proc_data.output_data[0]
+    output.size = 2
+    var_data = output["s"]._var_data
+    output["s"].reserve_bytes(100000)
+    size = var_data.size
+
+    assert size >= 100000
+    output["s"].extend(["x" * 50000, "y" * 49998])
+    assert var_data.size == size
+
+    proc_data.complete()
+    assert os.path.getsize(output["s"]._paths[2]) == 100000
+    assert output["s"][1] == "y" * 49998
+
+    with pytest.raises(RuntimeError):
+        output["i"].reserve_bytes(10)
+
+    with pytest.raises(ValueError):
+        output["s"].reserve_bytes(-1)
@@ -0,0 +1,31 @@
+import pytest
+
+from conftest import CT
+
+pd = pytest.importorskip("pandas")
+
+_columns = [("i", CT.INT, [1, None, 3], True), ("s", CT.STRING, ["a", None, "ccc"], True),
+            ("a", CT.ARRAY, [[1, 2], None, []], True), ("v", CT.VECTOR, [[1.0, 2.0], [3.0], [0.5]], False),
+            ("d", CT.DOUBLE, [0.5, 1.5, -2.0], False)]
+
+
+@pytest.mark.parametrize("dtype_backend", [None, "numpy_nullable", "pyarrow"])
+def test_round_trip(make_proc_data, dtype_backend):
+    if dtype_backend == "pyarrow":
+        pytest.importorskip("pyarrow")
+
+    proc_data = make_proc_data([("in", _columns)], [("out", [(name, column_type, nullable)
+                                                             for name, column_type, _, nullable in _columns])])
+    output = proc_data.output_data[0]
+    proc_data.from_df(proc_data.to_df(dtype_backend=dtype_backend), output)
+    proc_data.complete()
+
+    for column in proc_data.input_data[0]:
+        assert output[column.name][:] == column[:]
+
+
+def test_nulls_in_non_nullable_column_rejected(make_proc_data):
+    proc_data = make_proc_data(outputs=[("out", [("i", CT.INT, False)])])
+
+    with pytest.raises(ValueError):
+        proc_data.from_df(pd.DataFrame({"i": pd.array([1, None], "Int32")}), proc_data.output_data[0])
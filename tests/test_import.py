@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+
+import kinetica_proc
+from kinetica_proc import ProcData
+
+from conftest import CT
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_is_lazy_and_fast():
+    code = ("import sys, time\n"
+            "start = time.time()\n"
+            "import kinetica_proc\n"
+            "print(time.time() - start)\n"
+            "print(','.join(name for name in ('h2o', 'pandas', 'pyarrow') if name in sys.modules))\n")
+    env = dict(os.environ)
+    env.pop("KINETICA_PROC_WARM_UP", None)
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=_root, env=env).decode().split("\n")
+
+    assert float(output[0]) < 1.0
+    assert output[1] == ""
+
+
+def test_parallel_map_waits_for_warm_up(make_proc_data, monkeypatch):
+    proc_data = make_proc_data([("in", [("x", CT.INT, [1, 2, 3, 4], False)])])
+    imported = []
+    monkeypatch.setattr(kinetica_proc, "_backend", lambda name: imported.append(name))
+
+    thread = ProcData.warm_up(["numpy"])
+    proc_data.parallel_map(lambda proc_data, rows: None, 2)
+
+    assert not thread.is_alive()
+    assert imported == ["numpy"]
+    assert kinetica_proc._warm_up_threads == []
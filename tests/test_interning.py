@@ -0,0 +1,34 @@
+from conftest import CT
+
+
+def test_cache_bounded_within_slice(make_proc_data):
+    values = ["v" + str(i % 100) for i in range(1000)]
+    proc_data = make_proc_data([("in", [("s", CT.STRING, values, False)])])
+    column = proc_data.input_data[0]["s"]
+    column.enable_interning(max_size=10)
+    sizes = []
+
+    class Recorder(type(column._interned)):
+        def __setitem__(self, key, value):
+            super(Recorder, self).__setitem__(key, value)
+            sizes.append(len(self))
+
+    column._interned = Recorder()
+
+    assert column[:] == values
+    assert max(sizes) == 10
+    stats = column.interning_stats
+    assert stats["size"] == 10
+    assert stats["misses"] == 100
+    assert stats["evictions"] == 90
+
+
+def test_repeated_values_share_objects(make_proc_data):
+    proc_data = make_proc_data([("in", [("s", CT.STRING, ["a", "b", None, "a"], True)])])
+    column = proc_data.input_data[0]["s"]
+    column.enable_interning()
+    values = column[:]
+
+    assert values == ["a", "b", None, "a"]
+    assert values[0] is values[3]
+    assert column[3] is values[0]
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+from conftest import CT
+
+
+def _open_files():
+    return len(os.listdir("/proc/self/fd"))
+
+
+@pytest.fixture
+def table(make_proc_data):
+    columns = [("c" + str(i), CT.INT, list(range(100)), True) for i in range(20)]
+    columns.append(("s", CT.STRING, ["v" + str(i) for i in range(100)], False))
+    return make_proc_data([("in", columns)]).input_data[0]
+
+
+def test_columns_mapped_on_first_access(table):
+    assert not any(column.is_mapped for column in table)
+
+    assert table["c3"][5] == 5
+    assert [column.name for column in table if column.is_mapped] == ["c3"]
+    assert table["s"][7:9] == ["v7", "v8"]
+    assert table["c0"].size == 100
+    assert not table["c0"].is_mapped
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="requires /proc")
+def test_unmap(table):
+    files = _open_files()
+    values = [column[:] for column in table]
+    mapped = _open_files()
+
+    assert mapped > files
+
+    table["c1"].unmap()
+    assert not table["c1"].is_mapped
+    assert _open_files() < mapped
+
+    table.unmap()
+    assert _open_files() == files
+    assert not any(column.is_mapped for column in table)
+    assert [column[:] for column in table] == values
+
+
+def test_advise(table):
+    for advice in ("normal", "sequential", "random", "willneed", "hugepage", "dontneed"):
+        table["c2"].advise(advice)
+        table["s"].advise(advice, 10, 20)
+
+    table.advise("dontneed", columns=["c4"])
+    assert not table["c4"].is_mapped
+    assert table["c2"][:3] == [0, 1, 2]
+
+    with pytest.raises(ValueError):
+        table["c2"].advise("forget")
+
+
+def test_residency(make_proc_data):
+    table = make_proc_data([("in", [("i", CT.LONG, list(range(100000)), True)])]).input_data[0]
+    residency = table["i"].residency()
+
+    if residency is None:
+        pytest.skip("residency not supported")
+
+    assert 0.0 <= residency <= 1.0
+    assert table["i"][:][-1] == 99999
+    assert table["i"].residency() == 1.0
+    assert table.residency(10, 20) == 1.0
+    assert table["i"].residency(5, 5) == 1.0
@@ -0,0 +1,58 @@
+import json
+
+import kinetica_proc
+
+from conftest import CT
+
+
+def test_instrument():
+    class Target(object):
+        def work(self, count, nested=False):
+            return self.work(count) if nested else count * 2
+
+    target = Target()
+    stats = {"seconds": 0.0, "calls": 0, "depth": 0, "rows": 0, "bytes": 0}
+    kinetica_proc._instrument(target, "work", stats, lambda count, nested=False: (count, count * 8))
+
+    assert target.work(3) == 6
+    assert target.work(4, True) == 8
+    assert stats["calls"] == 2
+    assert (stats["rows"], stats["bytes"]) == (7, 56)
+    assert stats["seconds"] >= 0.0
+    assert stats["depth"] == 0
+
+
+def test_metrics(make_proc_data, tmp_path):
+    proc_data = make_proc_data([("in", [("i", CT.INT, list(range(100)), False), ("s", CT.STRING, ["ab"] * 100, True)])],
+                               [("out", [("i", CT.LONG, False), ("s", CT.STRING, True)])])
+    assert proc_data.metrics is None
+
+    path = str(tmp_path / "metrics.json")
+    proc_data.enable_metrics(results_key="metrics", path=path)
+    table = proc_data.input_data[0]
+    output = proc_data.output_data[0]
+    output.size = 100
+
+    output["i"].extend(table["i"][:])
+    output["s"].extend(table["s"][:50])
+
+    for value in table["s"][50:]:
+        output["s"].append(value)
+
+    metrics = proc_data.metrics
+    assert metrics["input"]["in"]["i"]["rows"] == 100
+    assert metrics["input"]["in"]["i"]["bytes"] == 400
+    assert metrics["input"]["in"]["s"]["rows"] == 100
+    assert metrics["output"]["out"]["i"] == dict(metrics["output"]["out"]["i"], type="LONG", rows=100, bytes=800)
+    assert metrics["output"]["out"]["s"]["rows"] == 100
+    assert metrics["types"]["INT"]["rows_decoded"] == 100
+    assert metrics["types"]["LONG"]["rows_encoded"] == 100
+
+    proc_data.complete()
+
+    with open(path) as metrics_file:
+        exported = json.load(metrics_file)
+
+    assert exported["complete_seconds"] is not None
+    assert exported["output"]["out"]["s"]["bytes"] == 100 * 8 + 100 + 300
+    assert json.loads(proc_data.results["metrics"])["input"] == exported["input"]
@@ -0,0 +1,71 @@
+import pytest
+
+from conftest import CT
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def table(make_proc_data):
+    proc_data = make_proc_data([("in", [("i", CT.INT, [1, -2, 3], False), ("d", CT.DOUBLE, [0.5, None, 2.5], True),
+                                        ("u", CT.ULONG, [0, 2 ** 64 - 1, 7], False),
+                                        ("b", CT.BOOLEAN, [True, False, True], False),
+                                        ("s", CT.STRING, ["a", "b", "c"], False)])])
+    return proc_data.input_data[0]
+
+
+def test_as_numpy(table):
+    values = table["i"].as_numpy()
+
+    assert values.dtype == np.int32
+    assert values.tolist() == [1, -2, 3]
+    assert table["u"].as_numpy().tolist() == [0, 2 ** 64 - 1, 7]
+    assert table["b"].as_numpy().tolist() == [True, False, True]
+    assert table["d"].as_numpy()[[0, 2]].tolist() == [0.5, 2.5]
+
+
+def test_as_numpy_is_read_only_view(table):
+    values = table["i"].as_numpy()
+
+    assert not values.flags.writeable
+    assert not values.flags.owndata
+
+    with pytest.raises(ValueError):
+        values[0] = 5
+
+
+def test_as_numpy_unsupported_type(table):
+    with pytest.raises(TypeError):
+        table["s"].as_numpy()
+
+
+def test_null_mask(table):
+    mask = table["d"].null_mask()
+
+    assert mask.tolist() == [False, True, False]
+    assert not mask.flags.writeable
+    assert table["i"].null_mask().tolist() == [False, False, False]
+
+
+def test_as_masked(table):
+    values = table["d"].as_masked()
+
+    assert values.mask.tolist() == [False, True, False]
+    assert values.sum() == 3.0
+    assert table["i"].as_masked().count() == 3
+
+
+def test_set_null_mask(make_proc_data):
+    proc_data = make_proc_data(outputs=[("out", [("n", CT.INT, True), ("i", CT.INT, False)])])
+    table = proc_data.output_data[0]
+    table.size = 3
+    table["n"][:] = [1, 2, 3]
+    table["n"].set_null_mask(np.array([False, True, True]))
+
+    assert table["n"][:] == [1, None, None]
+
+    with pytest.raises(IndexError):
+        table["n"].set_null_mask([True])
+
+    with pytest.raises(RuntimeError):
+        table["i"].set_null_mask([True, False, False])
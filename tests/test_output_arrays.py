@@ -0,0 +1,48 @@
+import struct
+
+import numpy as np
+import pytest
+
+from conftest import CT
+
+
+@pytest.fixture
+def output(make_proc_data):
+    proc_data = make_proc_data(outputs=[("out", [("i", CT.INT, False), ("n", CT.INT, True), ("f", CT.FLOAT, False),
+                                                 ("u", CT.ULONG, False)])])
+    table = proc_data.output_data[0]
+    table.size = 3
+    return table
+
+
+def test_out_of_range_integers_rejected(output):
+    with pytest.raises(struct.error):
+        output["i"][:] = np.array([2 ** 40, -1, 5], np.int64)
+
+    with pytest.raises(struct.error):
+        output["u"][:] = np.array([-1, 0, 1], np.int64)
+
+    with pytest.raises(struct.error):
+        output["i"][:] = np.array([2.0 ** 31, 0.0, 0.0])
+
+
+def test_nan_rejected_for_integer_column(output):
+    with pytest.raises(ValueError):
+        output["i"][:] = np.array([1.5, np.nan, 3.0])
+
+
+def test_float_overflow_rejected(output):
+    with pytest.raises(OverflowError):
+        output["f"][:] = np.array([1e300, 0.0, 0.0])
+
+
+def test_checked_values_written(output):
+    output["i"][:] = np.array([1.7, -2.5, 2147483647.0])
+    output["n"][:] = np.ma.masked_array([1.0, np.nan, 3.0], mask=[False, True, False])
+    output["f"][:] = np.array([1.5, np.inf, np.nan])
+    output["u"].extend(np.array([0, 2 ** 63, 5], np.uint64))
+
+    assert output["i"][:] == [1, -2, 2147483647]
+    assert output["n"][:] == [1, None, 3]
+    assert output["f"][:2] == [1.5, float("inf")]
+    assert output["u"][:] == [0, 2 ** 63, 5]
@@ -0,0 +1,92 @@
+import os
+import time
+
+import pytest
+
+import kinetica_proc
+
+from conftest import CT
+
+
+@pytest.fixture
+def proc_data(make_proc_data):
+    return make_proc_data([("in", [("x", CT.INT, list(range(10)), False), ("s", CT.STRING, list("abcdefghij"), False)])],
+                          [("out", [("x", CT.LONG, False), ("s", CT.STRING, True)])])
+
+
+def _assert_no_children():
+    with pytest.raises(OSError):
+        os.waitpid(-1, os.WNOHANG)
+
+
+def test_rows(proc_data):
+    output = proc_data.output_data[0]
+    output.auto_grow = True
+    output["x"].append(-1)
+    output["s"].append(None)
+
+    def fn(proc_data, rows):
+        table = proc_data.input_data[0]
+
+        for x, s in zip(table["x"][rows], table["s"][rows]):
+            output["x"].append(x * 10)
+            output["s"].append(s * 2)
+
+        proc_data.results["rows " + str(rows.start)] = str(rows.stop)
+        return rows.stop - rows.start
+
+    assert proc_data.parallel_map(fn, 3) == [3, 3, 4]
+    proc_data.complete()
+
+    assert output["x"][:] == [-1] + [x * 10 for x in range(10)]
+    assert output["s"][:] == [None] + [s * 2 for s in "abcdefghij"]
+    assert proc_data.results == {"rows 0": "3", "rows 3": "6", "rows 6": "10"}
+    _assert_no_children()
+
+
+def test_columns(proc_data):
+    parts = proc_data.parallel_map(lambda proc_data, columns: [column.name for column in columns], 4,
+                                   partition="columns")
+
+    assert parts == [["x"], ["s"]]
+    _assert_no_children()
+
+
+def test_worker_error(proc_data):
+    def fn(proc_data, rows):
+        if rows.start > 0:
+            raise KeyError("bad part")
+
+    with pytest.raises(RuntimeError) as error:
+        proc_data.parallel_map(fn, 2)
+
+    assert "Worker 1 failed" in str(error.value)
+    assert "bad part" in str(error.value)
+    _assert_no_children()
+
+
+def test_fork_failure_reaps_workers(proc_data, monkeypatch):
+    fork = os.fork
+    forks = []
+
+    def failing_fork():
+        if forks:
+            raise OSError("fork failed")
+
+        forks.append(None)
+        return fork()
+
+    monkeypatch.setattr(kinetica_proc.os, "fork", failing_fork)
+
+    with pytest.raises(OSError):
+        proc_data.parallel_map(lambda proc_data, rows: time.sleep(60), 2)
+
+    _assert_no_children()
+
+
+def test_invalid_arguments(proc_data):
+    with pytest.raises(ValueError):
+        proc_data.parallel_map(lambda proc_data, rows: None, 0)
+
+    with pytest.raises(ValueError):
+        proc_data.parallel_map(lambda proc_data, rows: None, partition="tables")
@@ -0,0 +1,34 @@
+import pytest
+
+from conftest import CT
+
+_columns = [("i", CT.INT, [1, None, 3, 4, 5], True), ("s", CT.STRING, ["a", "b", None, "d", "e"], True),
+            ("not valid", CT.DOUBLE, [0.5, 1.5, 2.5, 3.5, 4.5], False)]
+
+
+@pytest.fixture
+def table(make_proc_data):
+    return make_proc_data([("in", _columns)]).input_data[0]
+
+
+def test_tuples(table):
+    expected = list(zip(*[values for _, _, values, _ in _columns]))
+
+    assert list(table.rows()) == expected
+    assert list(table.rows(chunk_size=2)) == expected
+    assert list(table.rows(["s", "i"], chunk_size=3))[1:3] == [("b", None), (None, 3)]
+
+
+def test_namedtuples_and_dicts(table):
+    row = list(table.rows(as_="namedtuple"))[2]
+
+    assert (row.i, row.s, row._2) == (3, None, 2.5)
+    assert next(table.rows(["i", "s"], as_="dict")) == {"i": 1, "s": "a"}
+
+
+def test_invalid_arguments(table):
+    with pytest.raises(ValueError):
+        next(table.rows(chunk_size=0))
+
+    with pytest.raises(ValueError):
+        next(table.rows(as_="list"))
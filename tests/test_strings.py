@@ -0,0 +1,33 @@
+import pytest
+
+from conftest import CT
+
+_strings = ["a", "", None, "héllo ☃", "z" * 1000]
+
+
+@pytest.fixture
+def table(make_proc_data):
+    proc_data = make_proc_data([("in", [("s", CT.STRING, _strings, True),
+                                        ("j", CT.JSON, ['{"a": 1}', "[]", None, "1", "2"], True),
+                                        ("b", CT.BYTES, [b"\x00\x01", b"", None, b"\xff", b"x\x00"], True),
+                                        ("i", CT.INT, [1, 2, 3, 4, 5], False)])])
+    return proc_data.input_data[0]
+
+
+def test_slices(table):
+    assert table["s"][:] == _strings
+    assert table["s"][1:4] == _strings[1:4]
+    assert table["s"][::2] == _strings[::2]
+    assert [table["s"][i] for i in range(5)] == _strings
+    assert table["j"][:3] == ['{"a": 1}', "[]", None]
+    assert table["b"][:] == [b"\x00\x01", b"", None, b"\xff", b"x\x00"]
+
+
+def test_decode_strings(table):
+    assert table["s"].decode_strings() == _strings
+    assert table["s"].decode_strings(3, as_bytes=True) == [_strings[3].encode(), _strings[4].encode()]
+    assert table["s"].decode_strings(0, 2, ascii=True) == ["a", ""]
+    assert table["s"].decode_strings(4, 2) == []
+
+    with pytest.raises(TypeError):
+        table["i"].decode_strings()
@@ -0,0 +1,25 @@
+import decimal
+
+import pytest
+
+from conftest import CT
+
+pd = pytest.importorskip("pandas")
+
+
+def test_decimal_exact_by_default(make_proc_data):
+    proc_data = make_proc_data([("in", [("d", CT.DECIMAL, [123456789012345678, None, 10000], True)])])
+    df = proc_data.to_df()
+
+    assert list(df["d"]) == [decimal.Decimal("12345678901234.5678"), None, decimal.Decimal("1.0000")]
+
+
+def test_nullable_integers(make_proc_data):
+    proc_data = make_proc_data([("in", [("small", CT.LONG, [1, None, 3], True),
+                                        ("large", CT.LONG, [2 ** 60 + 1, None, 3], True),
+                                        ("full", CT.INT, [1, 2, 3], True)])])
+    df = proc_data.to_df()
+
+    assert df["small"].dtype == "float64"
+    assert list(df["large"]) == [2 ** 60 + 1, None, 3]
+    assert df["full"].dtype == "int32"
@@ -0,0 +1,53 @@
+import pytest
+
+from conftest import CT
+
+np = pytest.importorskip("numpy")
+
+
+def test_as_matrix(make_proc_data):
+    proc_data = make_proc_data([("in", [("v", CT.VECTOR, [[1.0, 2.0], [3.0, 4.0]], False),
+                                        ("n", CT.VECTOR, [[1.0, 2.0], None], True)])])
+    table = proc_data.input_data[0]
+
+    assert table["v"].as_matrix().tolist() == [[1.0, 2.0], [3.0, 4.0]]
+    matrix = table["n"].as_matrix()
+    assert matrix.shape == (2, 2)
+    assert np.isnan(matrix[1]).all()
+
+
+def test_as_matrix_uneven_dimensions(make_proc_data):
+    proc_data = make_proc_data([("in", [("v", CT.VECTOR, [[1.0, 2.0], [3.0], None, [4.0, 5.0]], True)])])
+    column = proc_data.input_data[0]["v"]
+    matrix = column.as_matrix()
+
+    assert matrix.dtype == object
+    assert [None if row is None else row.tolist() for row in matrix] == [[1.0, 2.0], [3.0], None, [4.0, 5.0]]
+    assert matrix[0].dtype == np.float32
+
+    values, offsets = column.as_ragged()
+    assert values.tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert offsets.tolist() == [0, 2, 3, 3, 5]
+
+
+def test_as_ragged_numeric_arrays(make_proc_data):
+    proc_data = make_proc_data([("in", [("a", CT.ARRAY, [[1, -2], [], None, [3]], True),
+                                        ("f", CT.ARRAY, [[1.5, 1e300], [-2.0]], False)])])
+    table = proc_data.input_data[0]
+
+    values, offsets = table["a"].as_ragged()
+    assert values.dtype == np.int64
+    assert values.tolist() == [1, -2, 3]
+    assert offsets.tolist() == [0, 2, 2, 2, 3]
+    assert table["f"].as_ragged()[0].tolist() == [1.5, 1e300, -2.0]
+
+
+def test_as_ragged_keeps_large_integers_exact(make_proc_data):
+    proc_data = make_proc_data([("in", [("a", CT.ARRAY, [[2 ** 64 + 5], [1]], False),
+                                        ("m", CT.ARRAY, [[2 ** 63], [0.5]], False)])])
+    table = proc_data.input_data[0]
+
+    values, offsets = table["a"].as_ragged()
+    assert values.tolist() == [2 ** 64 + 5, 1]
+    assert offsets.tolist() == [0, 1, 2]
+    assert table["m"].as_ragged()[0].tolist() == [2 ** 63, 0.5]